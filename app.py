@@ -1,17 +1,38 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-import pytz
+import csv
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+import fragment_timer
+import notices
+import rerun_profile
+from availability import DAY_END, DAY_START, format_minutes, get_availability
+from conflicts import SHOWN_CONFLICTS, describe, for_section as conflicts_for_section, get_conflicts
+from department import get_department
+from rerun_profile import markdown
+from gpa import cgpa, gradebook_template_csv, input_key, subjects_data, update_results
+from gpa_target import solve as solve_target
+from schedule_export import get_export
+from schedule_index import MINUTES_PER_DAY, get_index, get_snapshot, minute_of_week
+from schedule_render import day_html
+from schedule_store import Schedule
+from schedule_table import ScheduleTable
+from schedule_watch import SESSION_POLL_SECONDS, watch
+from section_registry import registry
 
 # -------------------------
 # Page Config
 # -------------------------
 st.set_page_config(page_title="Class Schedule", layout="wide")
 
+# Opt-in timing of each stage below (CLASS_SCHEDULE_PROFILE=1 or ?profile=1)
+rerun_profile.begin()
+rerun_profile.stage("css")
+
 # -------------------------
 # Custom CSS for styling
 # -------------------------
-st.markdown(
+markdown(
     """
     <style>
         /* Animated gradient background */
@@ -104,6 +125,47 @@ st.markdown(
             font-weight: bold;
         }
 
+        /* Week Grid */
+        .week-grid {
+            width: 100%;
+            border-collapse: collapse;
+            table-layout: fixed;
+            font-size: 0.8em;
+            color: #2c3e50;
+        }
+        .week-grid th, .week-grid td {
+            border: 1px solid rgba(44, 62, 80, 0.15);
+            padding: 4px;
+            vertical-align: top;
+        }
+        .week-grid .grid-time {
+            text-align: left;
+            font-weight: normal;
+        }
+        .week-grid .grid-day, .week-grid .grid-section {
+            width: 6em;
+            background-color: #2c3e50;
+            color: white;
+        }
+        .week-grid .grid-first {
+            border-top: 3px solid #2c3e50;
+        }
+        .week-grid .grid-busy {
+            background-color: #d6eaf8;
+        }
+        .week-grid .grid-class + .grid-class {
+            border-top: 1px dashed #5dade2;
+            margin-top: 3px;
+            padding-top: 3px;
+        }
+        .week-grid .grid-break {
+            background-color: #fdebd0;
+            text-align: center;
+        }
+        .week-grid .grid-free {
+            background-color: rgba(255, 255, 255, 0.4);
+        }
+
         /* Tabs */
         .stTabs [role="tab"] {
             font-weight: bold;
@@ -136,31 +198,38 @@ st.markdown(
 # -------------------------
 # Load Data
 # -------------------------
-def load_schedule(file):
+# Sections are discovered by the registry (sections.csv or $SCHEDULE_DIR) and
+# parsed on first use into a process-wide LRU store, so a rerun only pays for
+# a stat() of the selected file instead of a full read_csv of every file.
+def load_schedule(section):
     try:
-        return pd.read_csv(file)
-    except FileNotFoundError:
-        st.error(f"Error: The file '{file}' was not found. Please make sure it's in the same directory.")
-        return pd.DataFrame() # Return empty dataframe on error
-
-scheduleA = load_schedule("scheduleA.csv")
-scheduleB = load_schedule("scheduleB.csv")
+        return registry.get(section)
+    except FileNotFoundError as e:
+        st.error(f"Error: The file '{e.filename}' was not found. Please make sure it's in the same directory.")
+        return Schedule(section, None, ScheduleTable()) # Empty schedule on error
+    except (ValueError, csv.Error) as e:
+        # Not UTF-8, or a half-saved file
+        st.error(f"Error: The schedule for {section} could not be read ({e}).")
+        return Schedule(section, None, ScheduleTable())
 
 # -------------------------
 # Section Selector
 # -------------------------
-section = st.radio(
-    "Select Section",
-    ["BSCE-1A", "BSCE-1B", "GPA Calc"],
-    horizontal=True,
-    key="section_selector"
-)
+rerun_profile.stage("selector")
+section_options = registry.names() + ["GPA Calc"]
+
+# Radio buttons for a handful of sections, a searchable dropdown for a department
+if len(section_options) <= 6:
+    section = st.radio("Select Section", section_options, horizontal=True, key="section_selector")
+else:
+    section = st.selectbox("Select Section", section_options, key="section_selector")
 
 # -------------------------
 # GPA CALCULATOR LOGIC
 # -------------------------
 if section == "GPA Calc":
-    st.markdown(
+    rerun_profile.stage("gpa_form")
+    markdown(
         f"""
         <div class="title-box">
             <h1>GPA Calculator</h1>
@@ -172,173 +241,52 @@ if section == "GPA Calc":
 
     st.info("ℹ️ **Instructions:** Enter your obtained marks in the format **Obtained/Total** (e.g., `8/10`). Leave fields blank if the assessment hasn't happened yet; the system will project your score based on entered marks.")
 
-    # Helper function to parse "x/y" string
-    def get_score_percentage(entry):
-        if not entry:
-            return None
-        try:
-            if "/" in entry:
-                obtained, total = map(float, entry.split('/'))
-                return obtained / total
-            else:
-                # Fallback if user just types a number (assume out of 10 or 100? Safest to ignore or treat as raw)
-                # To stick to instructions, we expect x/x
-                return None
-        except ValueError:
-            return None
-
-    # Helper to convert percentage to Grade Point (Standard 4.0 scale assumption)
-    def pct_to_gp(pct):
-        if pct >= 85: return 4.0
-        elif pct >= 80: return 3.67
-        elif pct >= 75: return 3.33
-        elif pct >= 70: return 3.0
-        elif pct >= 67: return 2.67
-        elif pct >= 64: return 2.33
-        elif pct >= 60: return 2.0
-        elif pct >= 57: return 1.67
-        elif pct >= 54: return 1.33
-        elif pct >= 50: return 1.0
-        else: return 0.0
-
-    # Data Structure for Subjects and Weights
-    subjects_data = [
-        {
-            "name": "OHS", "cr": 1,
-            "components": [
-                ("Quiz 1", 10), ("Quiz 2", 10), ("Assignment 1", 5), ("Assignment 2", 5),
-                ("Report 1", 10), ("Mid 1", 15), ("Mid 2", 15), ("Finals", 40)
-            ]
-        },
-        {
-            "name": "Islamiat", "cr": 2,
-            "components": [
-                ("Quiz 1", 3.34), ("Quiz 2", 3.33), ("Quiz 3", 3.33), ("Quiz/Viva", 5),
-                ("Class Participation", 5), ("Mid 1", 15), ("Mid 2", 15), ("Finals", 50)
-            ]
-        },
-        {
-            "name": "ICP", "cr": 2,
-            "components": [
-                ("Quiz 1", 3), ("Quiz 2", 3), ("Quiz 3", 3), ("Quiz 4", 3),
-                ("Assignment 1", 4), ("Assignment 2", 4),
-                ("Mid 1", 15), ("Mid 2", 15), ("Finals", 50)
-            ]
-        },
-        {
-            "name": "Applied Physics", "cr": 2,
-            "components": [
-                ("Quiz 1", 2), ("Quiz 2", 2), ("Quiz 3", 2),
-                ("Assignment 1", 3), ("Assignment 2", 3), ("Assignment 3", 3),
-                ("Attendance", 5), ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
-            ]
-        },
-        {
-            "name": "Applied Calculus", "cr": 3,
-            "components": [
-                ("Quiz 1", 2), ("Quiz 2", 2), ("Quiz 3", 2), ("Quiz 4", 2), ("Quiz 5", 1),
-                ("Assignment 1", 3), ("Assignment 2", 4), ("Assignment 3", 4),
-                ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
-            ]
-        },
-        {
-            "name": "English", "cr": 3,
-            "components": [
-                ("Assignment 1", 2), ("Assignment 2", 1), ("Assignment 3", 2),
-                ("Quiz 1", 2), ("Quiz 2", 1), ("Quiz 3", 2),
-                ("Mid 1", 15), ("Mid 2", 15), ("Project", 6), ("Presentation", 4), ("Final", 50)
-            ]
-        },
-        {
-            "name": "ICT", "cr": 2,
-            "components": [
-                ("Assignment 1", 5), ("Assignment 2", 5), ("Assignment 3", 5),
-                ("Quiz 1", 2.5), ("Quiz 2", 2.5),
-                ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
-            ]
-        },
-        {
-            "name": "AP Lab", "cr": 1,
-            "components": [
-                ("Quiz 1", 2.5), ("Quiz 2", 2.5), ("Lab work", 52), ("Project", 8), ("Final", 35)
-            ]
-        },
-        {
-            "name": "ICT Lab", "cr": 1,
-            "components": [
-                ("Lab work", 36), ("Quiz", 6), ("Project", 8), ("Final", 50)
-            ]
-        }
-    ]
-
-    total_credits = 0
-    total_weighted_points = 0
-    
-    st.markdown('<div class="gpa-box">', unsafe_allow_html=True)
+    markdown('<div class="gpa-box">', unsafe_allow_html=True)
     
     # Generate Inputs
     with st.form("gpa_form"):
         col_idx = 0
         cols = st.columns(3) # 3 subjects per row layout
 
-        results_data = []
+        # Each box keeps its own key: the labels repeat across subjects, so
+        # keyless widgets would collide
+        entries_by_subject = {}
 
         for sub in subjects_data:
             with cols[col_idx % 3]:
                 with st.expander(f"**{sub['name']}** ({sub['cr']} Cr)"):
-                    weighted_sum_obtained = 0
-                    total_weight_attempted = 0
-                    
-                    sub_inputs = {}
-                    for comp_name, comp_weight in sub['components']:
-                        val = st.text_input(f"{comp_name} ({comp_weight}%)", key=f"{sub['name']}_{comp_name}", placeholder="e.g. 8/10")
-                        
-                        ratio = get_score_percentage(val)
-                        if ratio is not None:
-                            weighted_sum_obtained += (ratio * comp_weight)
-                            total_weight_attempted += comp_weight
-                    
-                    results_data.append({
-                        "subject": sub,
-                        "obtained_weight": weighted_sum_obtained,
-                        "attempted_weight": total_weight_attempted
-                    })
+                    entries_by_subject[sub['name']] = tuple(
+                        st.text_input(f"{comp_name} ({comp_weight}%)", key=input_key(sub['name'], comp_name), placeholder="e.g. 8/10")
+                        for comp_name, comp_weight in sub['components']
+                    )
             col_idx += 1
         
         submitted = st.form_submit_button("Calculate GPA")
 
+    gpa_recomputed = None
     if submitted:
-        st.markdown("---")
+        rerun_profile.stage("gpa_calc")
+        markdown("---")
         st.subheader("Results")
         
-        # Calculation Logic
-        valid_calculation = True
+        # One record per subject, keyed by its entries: a submit only regrades
+        # the subjects whose marks changed since the last one
+        subject_results = st.session_state.setdefault("gpa_results", {})
+        gpa_recomputed = update_results(subject_results, entries_by_subject)
         
-        for data in results_data:
-            sub = data['subject']
-            obt_w = data['obtained_weight']
-            att_w = data['attempted_weight']
+        for sub in subjects_data:
+            result = subject_results[sub['name']]
             
             # Projection Logic
-            if att_w == 0:
+            if result.percentage is None:
                 # No marks entered for this subject
-                final_percentage = 0.0
-                gpa = 0.0
                 st.warning(f"⚠️ **{sub['name']}**: No marks entered. Treated as 0.0 GPA.")
             else:
-                # Project performance to 100%
-                # Logic: (Obtained Weight / Attempted Weight) * 100
-                final_percentage = (obt_w / att_w) * 100
-                gpa = pct_to_gp(final_percentage)
-                
-                st.write(f"**{sub['name']}**: Projected Score: `{final_percentage:.2f}%` | GPA: `{gpa}`")
-
-            total_credits += sub['cr']
-            total_weighted_points += (sub['cr'] * gpa)
-
-        if total_credits > 0:
-            final_gpa = total_weighted_points / total_credits
-            st.markdown(
+                st.write(f"**{sub['name']}**: Projected Score: `{result.percentage:.2f}%` | GPA: `{result.grade_point}`")
+
+        final_gpa = cgpa(subject_results)
+        if final_gpa is not None:
+            markdown(
                 f"""
                 <div style="background-color: #2c3e50; padding: 20px; border-radius: 10px; text-align: center; color: #5dade2; margin-top: 20px;">
                     <h2>Calculated CGPA: {final_gpa:.2f}</h2>
@@ -349,18 +297,125 @@ if section == "GPA Calc":
         else:
             st.error("No credits found to calculate.")
 
-    st.markdown('</div>', unsafe_allow_html=True)
+    # -------------------------
+    # Target CGPA ("What do I need?")
+    # -------------------------
+    rerun_profile.stage("gpa_target")
+    with st.expander("🎯 What do I need? (target CGPA)"):
+        target = st.number_input("Target CGPA", min_value=0.0, max_value=4.0, value=3.0, step=0.01, format="%.2f", key="target_cgpa")
+        plan = solve_target(entries_by_subject, target)
+        if plan.reachable:
+            st.success(f"A CGPA of **{target:.2f}** is reachable. The least marks that get there (planned CGPA `{plan.cgpa:.2f}`):")
+        else:
+            st.warning(f"A CGPA of **{target:.2f}** is out of reach with the marks entered. The best possible is `{plan.cgpa:.2f}`:")
+        lines = ["| Subject | Aim for GP | Needed in each remaining component | Remaining |", "|---|---|---|---|"]
+        for sub in subjects_data:
+            subject_plan = plan.subjects[sub['name']]
+            if subject_plan.needed_percentage is not None:
+                needed = f"{subject_plan.needed_percentage:.2f}%"
+            elif subject_plan.remaining:
+                needed = "nothing more"
+            else:
+                needed = "–"
+            lines.append(f"| {sub['name']} | {subject_plan.grade_point} | {needed} | {', '.join(subject_plan.remaining) or '–'} |")
+        markdown("\n".join(lines))
+        st.caption("Uses the marks last submitted above. Each subject's remaining components are planned at the same score.")
+
+    markdown('</div>', unsafe_allow_html=True)
+
+    # -------------------------
+    # Batch Gradebook (instructors)
+    # -------------------------
+    rerun_profile.stage("gpa_batch")
+
+    # Grading and planning a class take seconds, so they are cached on the
+    # uploaded bytes (and target): reruns of this page, such as a calculator
+    # submit, reuse them instead of regrading the whole class
+    @st.cache_data(max_entries=8, show_spinner="Grading the gradebook...")
+    def graded_gradebook(data):
+        # pandas/numpy are only imported once a gradebook is uploaded
+        import io
+        import pandas as pd
+        import gpa_batch
+
+        results = gpa_batch.batch_gpa(pd.read_csv(io.BytesIO(data), dtype=str))
+        return results.round(2), gpa_batch.results_csv(results)
+
+    @st.cache_data(max_entries=8, show_spinner="Planning every student's target...")
+    def gradebook_plans(data, target):
+        import io
+        import pandas as pd
+        import gpa_batch
+
+        plans = gpa_batch.target_plans(pd.read_csv(io.BytesIO(data), dtype=str), target)
+        return int(plans["Reachable"].sum()), len(plans), gpa_batch.results_csv(plans)
+
+    with st.expander("📊 Batch gradebook (instructors)"):
+        st.write("Upload a CSV with one row per student and one column per assessment, using the template's column names. Marks use the same **Obtained/Total** format as above; bare numbers are read as percentages.")
+        st.download_button(
+            "Download template",
+            gradebook_template_csv(),
+            file_name="gradebook_template.csv",
+            mime="text/csv"
+        )
+
+        gradebook_file = st.file_uploader("Gradebook CSV", type="csv", key="gradebook_upload")
+        if gradebook_file is not None:
+            data = gradebook_file.getvalue()
+            results, results_csv = graded_gradebook(data)
+            st.dataframe(results, hide_index=True)
+            st.download_button(
+                "Download results",
+                results_csv,
+                file_name="gpa_results.csv",
+                mime="text/csv"
+            )
+
+            class_target = st.number_input("Target CGPA for every student", min_value=0.0, max_value=4.0, value=3.0, step=0.01, format="%.2f", key="class_target_cgpa")
+            reachable, students, plans_csv = gradebook_plans(data, class_target)
+            st.caption(f"{reachable} of {students} students can still reach {class_target:.2f}.")
+            st.download_button(
+                "Download target plans",
+                plans_csv,
+                file_name="gpa_target_plans.csv",
+                mime="text/csv"
+            )
 
 # -------------------------
 # SCHEDULE LOGIC (Run only if section is NOT GPA Calc)
 # -------------------------
 else:
-    schedule = scheduleA if section == "BSCE-1A" else scheduleB
+    rerun_profile.stage("load_schedule")
+    # Note the latest change before loading, so one landing in between is
+    # caught by the live-update fragment below
+    watcher = watch(registry)
+    latest_change = watcher.latest(section)
+    st.session_state["schedule_seen_change"] = latest_change.seq if latest_change else 0
+    schedule = load_schedule(section)
+    index = get_index(schedule)
+
+    # -------------------------
+    # Live Updates
+    # -------------------------
+    # The watcher thread reloads edited section files in the background.
+    # This fragment only compares sequence numbers, and reruns the page when
+    # this section changed, so edits reach open sessions within seconds.
+    @st.fragment(run_every=SESSION_POLL_SECONDS)
+    def live_updates():
+        change = watcher.latest(section)
+        if change is not None and change.seq != st.session_state.get("schedule_seen_change"):
+            st.session_state["schedule_changed_days"] = change.days
+            st.rerun()
+
+    live_updates()
+    if "schedule_changed_days" in st.session_state:
+        changed = st.session_state.pop("schedule_changed_days")
+        st.toast(f"Schedule updated: {', '.join(changed)}" if changed else "Schedule updated")
 
     # -------------------------
     # Title Box
     # -------------------------
-    st.markdown(
+    markdown(
         f"""
         <div class="title-box">
             <h1>{section}</h1>
@@ -373,202 +428,231 @@ else:
     # -----------------------------------
     # Happening Now & Next Up Box
     # -----------------------------------
-    st.markdown('<div class="status-container">', unsafe_allow_html=True)
-
     # Define the timezone for GMT+5
-    tz = pytz.timezone('Asia/Karachi')
-
-    # Get current time in the specified timezone
-    now = datetime.now(tz)
-    current_time_obj = now.time()
-    today = now.strftime("%A")
-
-    today_schedule = schedule[schedule["Day"] == today].copy()
-
-    current_class = None
-    next_class = None
-
-    if not today_schedule.empty:
-        # Convert time strings to datetime.time objects for correct comparison
-        today_schedule['start_time_obj'] = pd.to_datetime(today_schedule['Start_Time'], format='%H:%M').dt.time
-        today_schedule['end_time_obj'] = pd.to_datetime(today_schedule['End_Time'], format='%H:%M').dt.time
-
-        # Sort schedule chronologically
-        today_schedule = today_schedule.sort_values(by="start_time_obj")
-
-        for _, row in today_schedule.iterrows():
-            # Check for the currently happening class
-            if row['start_time_obj'] <= current_time_obj <= row['end_time_obj']:
-                current_class = row
-            # Find the *first* class that is after the current time
-            elif row['start_time_obj'] > current_time_obj and next_class is None:
-                next_class = row
-
-    if current_class is not None:
-        st.markdown(
-            f"""
-            <div class="status-box">
-                📘 Happening Now: <br>
-                {current_class['Course']} <br>
-                ⏰ {current_class['Start_Time']} - {current_class['End_Time']} <br>
-                👨‍🏫 {current_class['Teacher']} <br>
-                📍 {current_class['Venue']}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    tz = ZoneInfo('Asia/Karachi')
+    today = datetime.now(tz).strftime("%A")
+
+    # Rendered as a fragment that the browser re-runs on its own exactly when
+    # the next class starts or ends, without re-executing the rest of the page.
+    def status_panel():
+        markdown('<div class="status-container">', unsafe_allow_html=True)
+
+        # Re-fetch through the store (a stat()) so an edited file is picked up
+        schedule = load_schedule(section)
+        index = get_index(schedule)
+        snapshot = get_snapshot(schedule)
+
+        # Get current time in the specified timezone
+        now = datetime.now(tz)
+        today = now.strftime("%A")
+
+        # Served from the section's shared snapshot, which is only recomputed
+        # when a class starts or ends. Several classes can be in progress at
+        # once and the next class may be on a later day.
+        current_classes, next_class, next_start = snapshot.get(now)
+        has_classes_today = today in index.days
+        next_is_today = next_class is not None and next_start // MINUTES_PER_DAY == minute_of_week(now) // MINUTES_PER_DAY
+
+        for current_class in current_classes:
+            markdown(
+                f"""
+                <div class="status-box">
+                    📘 Happening Now: <br>
+                    {current_class['Course']} <br>
+                    ⏰ {current_class['Start_Time']} - {current_class['End_Time']} <br>
+                    👨‍🏫 {current_class['Teacher']} <br>
+                    📍 {current_class['Venue']}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
 
-    if next_class is not None:
-        st.markdown(
-            f"""
-            <div class="status-box">
-                ⏭️ Next Up: <br>
-                {next_class['Course']} <br>
-                ⏰ {next_class['Start_Time']} - {next_class['End_Time']} <br>
-                👨‍🏫 {next_class['Teacher']} <br>
-                📍 {next_class['Venue']}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        if next_class is not None:
+            markdown(
+                f"""
+                <div class="status-box">
+                    ⏭️ Next Up{"" if next_is_today else f" ({next_class['Day'].strip()} {next_class['Start_Time']})"}: <br>
+                    {next_class['Course']} <br>
+                    ⏰ {next_class['Start_Time']} - {next_class['End_Time']} <br>
+                    👨‍🏫 {next_class['Teacher']} <br>
+                    📍 {next_class['Venue']}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+        # Handle cases where there are no classes today or classes are over
+        if not has_classes_today:
+            st.info(f"🎉 No classes scheduled for today ({today})!")
+        elif not current_classes and not next_is_today:
+            st.info("🎉 All classes for today are over!")
 
-    # Handle cases where there are no classes today or classes are over
-    if today_schedule.empty:
-        st.info(f"🎉 No classes scheduled for today ({today})!")
-    elif current_class is None and next_class is None:
-        st.info("🎉 All classes for today are over!")
+        markdown('</div>', unsafe_allow_html=True)
 
-    st.markdown('</div>', unsafe_allow_html=True)
+        # Schedule the next refresh a second after the next boundary
+        fragment_timer.rearm(snapshot.seconds_until_change(now) + 1)
+
+    rerun_profile.stage("now_next")
+    first_refresh = get_snapshot(schedule).seconds_until_change(datetime.now(tz)) + 1
+    st.fragment(run_every=first_refresh)(status_panel)()
 
     # -------------------------
-    # Tabs for Days
+    # Schedule per Day
     # -------------------------
-    day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    days = sorted(schedule["Day"].unique(), key=lambda day: day_order.index(day) if day in day_order else -1)
+    days = index.days
+
+    if schedule.table.dropped:
+        st.warning(f"{schedule.table.dropped} rows of this schedule have an unknown day or an invalid time (use HH:MM) and are not shown.")
 
     if not days:
         st.warning("The selected schedule file is empty or invalid.")
     else:
-        tabs = st.tabs(days)
+        # "Day" renders only the chosen day; "Week tabs" keeps the classic
+        # layout. Either way each day is a single cached HTML block.
+        layout = st.radio("View", ["Day", "Week tabs", "Week grid"], horizontal=True, key="day_layout")
+
+        if layout == "Day":
+            # A fragment, so picking another day reruns only this block
+            @st.fragment
+            def day_view():
+                day = st.radio(
+                    "Day",
+                    days,
+                    index=days.index(today) if today in days else 0,
+                    horizontal=True,
+                    key="day_selector"
+                )
+                rerun_profile.stage(f"day:{day}")
+                markdown(day_html(schedule, day), unsafe_allow_html=True)
+
+            day_view()
+        elif layout == "Week grid":
+            # The whole week as one cached table; loads numpy, so only here
+            import week_grid
+
+            rerun_profile.stage("week_grid")
+            others = [name for name in registry.names() if name != section]
+            compared = st.multiselect("Compare with", others, key="compare_sections")
+            if compared:
+                schedules = {section: schedule}
+                for name in compared:
+                    try:
+                        schedules[name] = registry.get(name)
+                    except FileNotFoundError:
+                        st.warning(f"No schedule file for {name}.")
+                markdown(week_grid.compare_html(schedules), unsafe_allow_html=True)
+            else:
+                markdown(week_grid.week_grid_html(schedule), unsafe_allow_html=True)
+        else:
+            tabs = st.tabs(days)
+            for i, day in enumerate(days):
+                with tabs[i]:
+                    rerun_profile.stage(f"day:{day}")
+                    markdown(day_html(schedule, day), unsafe_allow_html=True)
+
         # -------------------------
-        # Show schedule per day
+        # Calendar / JSON Export
         # -------------------------
-        for i, day in enumerate(days):
-            with tabs[i]:
-                day_schedule = schedule[schedule["Day"] == day].copy()
-                
-                day_schedule['Start_Time_dt'] = pd.to_datetime(day_schedule['Start_Time'], format='%H:%M')
-                day_schedule = day_schedule.sort_values(by="Start_Time_dt")
-
-                prev_end = None
-                for _, row in day_schedule.iterrows():
-                    start = datetime.strptime(row["Start_Time"], "%H:%M")
-                    end = datetime.strptime(row["End_Time"], "%H:%M")
-
-                    if prev_end:
-                        gap_minutes = (start - prev_end).total_seconds() / 60
-                        if gap_minutes > 15: # Only display breaks longer than 15 mins
-                            
-                            # Calculate hours and minutes for display
-                            hours = int(gap_minutes // 60)
-                            minutes = int(gap_minutes % 60)
-                            
-                            display_text = ""
-                            if hours > 0:
-                                display_text += f"{hours} hr "
-                            if minutes > 0:
-                                display_text += f"{minutes} min"
-                            
-                            st.markdown(f'<div class="break-box">☕ Break ({display_text.strip()})</div>', unsafe_allow_html=True)
-
-                    st.markdown(
-                        f"""
-                        <div class="class-box">
-                            <b>📘 {row['Course']}</b><br>
-                            ⏰ {row['Start_Time']} - {row['End_Time']}<br>
-                            👨‍🏫 {row['Teacher']}<br>
-                            📍 {row['Venue']}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
+        rerun_profile.stage("export")
+        with st.expander("📅 Add to your calendar"):
+            col1, col2 = st.columns(2)
+            for col, fmt, label in [(col1, "ics", "Download .ics (calendar)"), (col2, "json", "Download .json")]:
+                exported = get_export(section, schedule, fmt)
+                col.download_button(label, exported.body, file_name=exported.filename, mime=exported.content_type, key=f"export_{fmt}")
+            st.caption(f"When the app is started with `streamlit run server.py`, calendar apps can subscribe to `/export/{section}.ics` and stay up to date.")
+
+    # -------------------------
+    # Timetable Clashes
+    # -------------------------
+    # Teacher/venue double-bookings across every section, recomputed only
+    # when a section file changes
+    rerun_profile.stage("conflicts")
+    department = get_department(registry)
+    all_conflicts = get_conflicts(department)
+    section_conflicts = conflicts_for_section(all_conflicts, section)
+    if section_conflicts:
+        with st.expander(f"⚠️ Timetable clashes involving {section} ({len(section_conflicts)})"):
+            lines = [f"- {describe(c, section)}" for c in section_conflicts[:SHOWN_CONFLICTS]]
+            if len(section_conflicts) > SHOWN_CONFLICTS:
+                lines.append(f"- …and {len(section_conflicts) - SHOWN_CONFLICTS} more")
+            markdown("\n".join(lines))
+            st.caption(
+                f"Checked {len(department.section_names)} sections ({len(department)} classes); "
+                f"{sum(c.pairs for c in all_conflicts):,} clashing pairs of classes department-wide."
+            )
+    if department.unreadable:
+        st.warning(
+            "Clashes and free rooms leave out sections that could not be read: "
+            + ", ".join(f"{name} ({error})" for name, error in department.unreadable.items())
+        )
+
+    # -------------------------
+    # Free Rooms and Teachers
+    # -------------------------
+    rerun_profile.stage("availability")
+    availability = get_availability(department)
+    if availability.days:
+        # A fragment, so changing a query reruns only this panel
+        @st.fragment
+        def availability_panel():
+            with st.expander("🔎 Find a free room / teacher"):
+                room_tab, teacher_tab = st.tabs(["Free rooms", "Free teachers"])
+                with room_tab:
+                    day = st.selectbox(
+                        "Day",
+                        availability.days,
+                        index=availability.days.index(today) if today in availability.days else 0,
+                        key="free_room_day"
                     )
-                    prev_end = end
+                    col1, col2 = st.columns(2)
+                    start = col1.time_input("From", time(10, 0), step=600, key="free_room_from")
+                    end = col2.time_input("To", time(11, 0), step=600, key="free_room_to")
+                    start_minute = start.hour * 60 + start.minute
+                    end_minute = end.hour * 60 + end.minute
+                    if end_minute <= start_minute:
+                        st.info("Pick an end time after the start time.")
+                    else:
+                        rooms = availability.free_venues(day, start_minute, end_minute)
+                        if rooms:
+                            markdown(f"**Free on {day}, {start:%H:%M}–{end:%H:%M}:** " + ", ".join(rooms))
+                        else:
+                            st.info("No rooms are free for that whole slot.")
+                with teacher_tab:
+                    teacher = st.selectbox("Teacher", availability.teacher_names(), key="free_teacher")
+                    free = availability.teacher_free(teacher)
+                    lines = []
+                    for free_day in availability.days:
+                        slots = ", ".join(f"{format_minutes(s)}–{format_minutes(e)}" for s, e in free.get(free_day, []))
+                        lines.append(f"- **{free_day}:** {slots or 'no free time'}")
+                    markdown("\n".join(lines))
+                    st.caption(f"Free time between {format_minutes(DAY_START)} and {format_minutes(DAY_END)}, not counting other commitments.")
+
+        availability_panel()
 
     # ------------------------------------------------------------------
     # DYNAMIC Notices and Assignments Sections
     # ------------------------------------------------------------------
-    # Check which section is selected and display content accordingly
-    if section == "BSCE-1A":
-        # --- Notices for section 1A ---
-        st.markdown(
-            """
-            <div class="notices-box">
-                <h3>📢 Notices for BSCE-1A</h3>
-                <ul>
-                    <li>Report any bugs/issues or change of schedule to me on Whatsapp </li>
-                    <li><b>All classes scheduled for 8th and 9th Sept will be conducted online due to adverse weather</b></li>
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # --- Assignments for section 1A ---
-        st.markdown(
-            """
-            <div class="assignments-box">
-                <h3>📝 Assignments Due for BSCE-1A</h3>
-                <ul>
-                    <li><b> </b> </li>
-                    <li><b></b></li>
-                    
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-    elif section == "BSCE-1B":
-        # --- Notices for section 1B ---
-        st.markdown(
-            """
-            <div class="notices-box">
-                <h3>📢 Notices for BSCE-1B</h3>
-                <ul>
-                    <li>Report any bugs or issues to me on whatsapp </li>
-                    <li>  </li>
-                    <li>    </li>
-                    <li> <b></b> </li>
-                    
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # --- Assignments for section 1B ---
-        st.markdown(
-            """
-            <div class="assignments-box">
-                <h3>📝 Assignments Due for BSCE-1B</h3>
-                <ul>
-                    <li><b>ICT Lab:Complete Lab 5 : Intro to Viso and Flutter flow (Submission on Monday) </b> </li>
-                    <li><b>  </b></li>
-                    <li><b>  </b></li>
-                    <li><b> Eng:  </b></li>
-                    <li><b> </b><li>
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    # Items come from the notices database (``python notices.py add ...``);
+    # the section's HTML is cached until an item changes or expires
+    rerun_profile.stage("notices")
+    section_notices = notices.section_html(section)
+    if section_notices:
+        markdown(section_notices, unsafe_allow_html=True)
 
 # -------------------------
 # Footer
 # -------------------------
-st.markdown("<footer>Created by Wassay Ahmed</footer>", unsafe_allow_html=True)
-
-
-
-
-
-
-
+rerun_profile.stage("footer")
+markdown("<footer>Created by Wassay Ahmed</footer>", unsafe_allow_html=True)
+
+if rerun_profile.active():
+    profile_extra = {"store": registry.stats()}
+    if section != "GPA Calc":
+        profile_extra["watch"] = watcher.stats()
+        profile_extra["notices"] = notices.store.stats()
+        profile_extra["now_next"] = get_snapshot(schedule).stats()
+        profile_extra["table"] = {"rows": len(schedule.table), "bytes": schedule.table.nbytes()}
+    elif gpa_recomputed is not None:
+        profile_extra["gpa_recomputed"] = gpa_recomputed
+    rerun_profile.set_label(section)
+    rerun_profile.finish(profile_extra)
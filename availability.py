@@ -0,0 +1,135 @@
+"""Free-room and free-teacher queries over the whole department.
+
+For every venue and teacher the busy intervals of the week are merged and
+sorted once per department version, and their complement within teaching
+hours is kept as a sorted free list, so "when is Dr. X free" is a lookup.
+
+For "which rooms are free Tuesday 10:00-11:00" each day is cut into
+segments at every class start and end, and each segment stores the set of
+booked venues as a bitmask (bit i is the i-th venue by name). A query ORs
+the masks of the few segments it overlaps, instead of checking every venue
+or scanning every section's classes.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+from conflicts import resource_key
+from schedule_index import DAY_ORDER, MINUTES_PER_DAY
+
+# Teaching hours that free time is reported within
+DAY_START = 8 * 60
+DAY_END = 18 * 60
+
+
+def merge(intervals):
+    """Merge sorted (start, end) intervals into disjoint (starts, ends) lists."""
+    starts, ends = [], []
+    for start, end in intervals:
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+class Resource:
+    """One venue's or teacher's week: merged busy intervals and free gaps."""
+
+    def __init__(self, name, busy, days):
+        self.name = name
+        self.busy_starts, self.busy_ends = merge(sorted(busy))
+        self.free = []
+        for day in days:
+            lo, hi = day * MINUTES_PER_DAY + DAY_START, day * MINUTES_PER_DAY + DAY_END
+            cursor = lo
+            i = bisect_right(self.busy_ends, lo)
+            while i < len(self.busy_starts) and self.busy_starts[i] < hi:
+                if self.busy_starts[i] > cursor:
+                    self.free.append((cursor, self.busy_starts[i]))
+                cursor = max(cursor, self.busy_ends[i])
+                i += 1
+            if cursor < hi:
+                self.free.append((cursor, hi))
+
+
+class AvailabilityIndex:
+    """Per-venue and per-teacher availability for one department version."""
+
+    def __init__(self, department):
+        days = sorted({start // MINUTES_PER_DAY for start in department.starts})
+        self.days = [DAY_ORDER[d] for d in days]
+
+        busy = {"Venue": {}, "Teacher": {}}
+        names = {"Venue": {}, "Teacher": {}}
+        for row, start, end in zip(department.rows, department.starts, department.ends):
+            for column in busy:
+                key = resource_key(row[column])
+                if not key:
+                    # A blank cell is missing data, not a teacher or room
+                    continue
+                busy[column].setdefault(key, []).append((start, end))
+                # Show each resource under the first spelling seen
+                names[column].setdefault(key, str(row[column]).strip())
+
+        self.venues = {key: Resource(names["Venue"][key], b, days) for key, b in busy["Venue"].items()}
+        self.teachers = {key: Resource(names["Teacher"][key], b, days) for key, b in busy["Teacher"].items()}
+
+        # Per day: segment boundaries (minute-of-week) and each segment's booked-venue mask
+        venue_list = sorted(self.venues.values(), key=lambda r: r.name.casefold())
+        self._venue_names = [venue.name for venue in venue_list]
+        self._all_venues = (1 << len(venue_list)) - 1
+        self._segments = {}
+        for day in days:
+            lo, hi = day * MINUTES_PER_DAY, (day + 1) * MINUTES_PER_DAY
+            points = set()
+            for venue in venue_list:
+                i, j = bisect_right(venue.busy_ends, lo), bisect_left(venue.busy_starts, hi)
+                points.update(venue.busy_starts[i:j])
+                points.update(venue.busy_ends[i:j])
+            points = sorted(points)
+            masks = [0] * max(len(points) - 1, 0)
+            for bit, venue in enumerate(venue_list):
+                i, j = bisect_right(venue.busy_ends, lo), bisect_left(venue.busy_starts, hi)
+                for start, end in zip(venue.busy_starts[i:j], venue.busy_ends[i:j]):
+                    for k in range(bisect_left(points, start), bisect_left(points, end)):
+                        masks[k] |= 1 << bit
+            self._segments[day] = (points, masks)
+
+    def free_venues(self, day, start, end):
+        """Names of venues free on ``day`` (a day name) for [start, end) minutes after midnight."""
+        day = DAY_ORDER.index(day)
+        points, masks = self._segments.get(day, ([], []))
+        offset = day * MINUTES_PER_DAY
+        # Segment k is [points[k], points[k + 1]); take those overlapping [start, end)
+        lo = max(bisect_right(points, offset + start) - 1, 0)
+        hi = min(bisect_left(points, offset + end), len(masks))
+        booked = 0
+        for mask in masks[lo:hi]:
+            booked |= mask
+        free = bin(self._all_venues & ~booked)[2:].zfill(len(self._venue_names))[::-1]
+        return list(compress(self._venue_names, map("1".__eq__, free)))
+
+    def teacher_names(self):
+        return sorted((t.name for t in self.teachers.values()), key=str.casefold)
+
+    def teacher_free(self, name):
+        """{day name: [(start, end), ...]} free slots for teacher ``name`` (minutes after midnight)."""
+        teacher = self.teachers.get(resource_key(name))
+        if teacher is None:
+            return {}
+        free = {}
+        for start, end in teacher.free:
+            day = start // MINUTES_PER_DAY
+            free.setdefault(DAY_ORDER[day], []).append((start - day * MINUTES_PER_DAY, end - day * MINUTES_PER_DAY))
+        return free
+
+
+def get_availability(department):
+    """The department's availability index, built once per department version."""
+    return department.derive("availability", AvailabilityIndex)
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
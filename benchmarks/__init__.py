@@ -0,0 +1 @@
+"""Benchmarks for the schedule and GPA code paths. Run modules with ``python -m benchmarks.<name>``."""
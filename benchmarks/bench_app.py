@@ -0,0 +1,102 @@
+"""Headless full-script timings of app.py with Streamlit's AppTest harness.
+
+    python -m benchmarks.bench_app [--quick]
+
+For each (sections, rows per section) combination a synthetic schedule
+directory is generated and the registry pointed at it. The script is then
+timed for a first view of a section (cold: parse + index + render), repeat
+views (warm caches), switching between two sections, and a GPA form
+submit with synthetic marks.
+"""
+
+import itertools
+import os
+import random
+import sys
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+import section_registry
+from benchmarks.harness import measure, result, write_report
+from benchmarks.synth import write_sections
+from gpa import input_key, subjects_data
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# (sections, rows per section)
+MATRIX = [(1, 10), (2, 40), (10, 1_000), (100, 100), (1_000, 10), (1, 100_000)]
+QUICK_MATRIX = [(2, 40), (10, 1_000)]
+
+
+def select_section(at, name):
+    """Pick ``name`` in the section selector, whichever widget it is rendered as."""
+    widgets = at.selectbox if any(w.key == "section_selector" for w in at.selectbox) else at.radio
+    widgets(key="section_selector").set_value(name)
+    return at.run()
+
+
+def checked(at):
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+    return at
+
+
+def bench_schedules(sections, rows, repeat):
+    params = {"sections": sections, "rows_per_section": rows}
+    original = section_registry.registry
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_sections(directory, sections, rows)
+        section_registry.registry = section_registry.SectionRegistry(directory, original.store)
+        original.store.clear()
+        try:
+            at = checked(AppTest.from_file(APP, default_timeout=120).run())
+            results = []
+
+            # Cold: the section has to be parsed, indexed and rendered again
+            def cold():
+                original.store.clear()
+                checked(at.run())
+
+            results.append(result("app_section_cold", params, measure(cold, repeat=min(repeat, 3))))
+
+            results.append(result("app_section_warm", params, measure(lambda: checked(at.run()), repeat=repeat)))
+
+            targets = [names[0], names[min(1, len(names) - 1)]]
+            flip = itertools.count()
+            switch = measure(lambda: checked(select_section(at, targets[next(flip) % 2])), repeat=repeat)
+            results.append(result("app_section_switch", params, switch))
+            return results
+        finally:
+            section_registry.registry = original
+            original.store.clear()
+
+
+def bench_gpa_submit(repeat):
+    rng = random.Random(0)
+    at = checked(AppTest.from_file(APP, default_timeout=120).run())
+    checked(select_section(at, "GPA Calc"))
+
+    def submit():
+        for sub in subjects_data:
+            for comp, _ in sub["components"]:
+                total = rng.choice([10, 20, 50])
+                value = "" if rng.random() < 0.3 else f"{rng.randint(0, total)}/{total}"
+                at.text_input(key=input_key(sub["name"], comp)).input(value)
+        at.button(key="FormSubmitter:gpa_form-Calculate GPA").click()
+        checked(at.run())
+
+    return [result("app_gpa_submit", {"components": sum(len(s["components"]) for s in subjects_data)}, measure(submit, repeat=repeat))]
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    results = []
+    for sections, rows in QUICK_MATRIX if quick else MATRIX:
+        results += bench_schedules(sections, rows, repeat)
+    results += bench_gpa_submit(repeat)
+    return results
+
+
+if __name__ == "__main__":
+    write_report(run(quick="--quick" in sys.argv))
@@ -0,0 +1,294 @@
+"""Microbenchmarks of the pure functions behind the app.
+
+    python -m benchmarks.bench_functions [--quick]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import closing
+from datetime import datetime
+
+from benchmarks.bench_now_next import legacy_now_next
+from benchmarks.harness import measure, result, write_report
+from benchmarks.synth import synthetic_department, synthetic_gradebook, synthetic_schedule, write_sections
+from gpa import get_score_percentage, pct_to_gp
+from schedule_export import build_export, get_export
+from schedule_index import ScheduleIndex, minute_of_week
+from schedule_render import build_day_html
+from schedule_store import Schedule
+from schedule_table import ScheduleTable
+
+ROW_COUNTS = [10, 100, 1_000, 10_000, 100_000]
+QUICK_ROW_COUNTS = [10, 1_000]
+
+MARKS = ["8/10", "14.5/20", "", "abc", "5/0", "47/50"]
+
+
+def bench_marks():
+    def parse():
+        for entry in MARKS:
+            get_score_percentage(entry)
+
+    def grade():
+        for pct in range(0, 101, 5):
+            pct_to_gp(pct)
+
+    return [
+        result("get_score_percentage", {"entries": len(MARKS)}, measure(parse, repeat=5, number=20_000)),
+        result("pct_to_gp", {"values": 21}, measure(grade, repeat=5, number=20_000)),
+    ]
+
+
+def bench_gpa_form():
+    """A form submit: regrading every subject vs. only the one that changed."""
+    import random
+
+    from benchmarks.synth import synthetic_marks
+    from gpa import subjects_data, update_results
+    from gpa_target import _options, solve
+
+    rng = random.Random(0)
+    entries = {sub["name"]: tuple(synthetic_marks(rng) for _ in sub["components"]) for sub in subjects_data}
+    changed = dict(entries, **{subjects_data[0]["name"]: ("1/10",) * len(subjects_data[0]["components"])})
+    results = {}
+    update_results(results, entries)
+
+    def one_changed():
+        update_results(results, changed)
+        update_results(results, entries)
+
+    return [
+        result("gpa_submit_all", {"subjects": len(subjects_data)}, measure(lambda: update_results({}, entries), number=1000)),
+        # Two submits per call, each regrading one subject
+        result("gpa_submit_one_changed", {"subjects": len(subjects_data)}, measure(one_changed, number=500)),
+        result("gpa_target_solve", {"subjects": len(subjects_data)}, measure(lambda: (_options.cache_clear(), solve(entries, 3.0)), number=20)),
+    ]
+
+
+def bench_schedule(rows):
+    import week_grid
+
+    frame = synthetic_schedule(rows)
+    now = datetime(2025, 9, 10, 10, 30)
+    table = ScheduleTable.from_frame(frame)
+    index = ScheduleIndex(table)
+    minute = minute_of_week(now)
+    slow = rows >= 10_000
+    params = {"rows": rows}
+
+    def breaks():
+        for day in index.days:
+            list(index.breaks(day))
+
+    def render():
+        for day in index.days:
+            build_day_html(index, day)
+
+    schedule = Schedule("bench", None, table)
+    get_export("bench", schedule, "ics")
+
+    return [
+        result("table_build", params, measure(lambda: ScheduleTable.from_frame(frame), repeat=3 if slow else 10)),
+        result("index_build", params, measure(lambda: ScheduleIndex(table), repeat=3 if slow else 10)),
+        result("now_next_index", params, measure(lambda: index.now_next(minute), repeat=5, number=1000)),
+        result("now_next_legacy", params, measure(lambda: legacy_now_next(frame, now), repeat=3 if slow else 20)),
+        result("breaks", params, measure(breaks, repeat=5, number=10)),
+        result("day_html_all_days", params, measure(render, repeat=3 if slow else 10)),
+        result("week_grid_build", params, measure(lambda: week_grid.build_grid(index, *week_grid.grid_range([index])), repeat=3 if slow else 10)),
+        result("export_ics_build", params, measure(lambda: build_export("bench", index, "ics"), repeat=3 if slow else 10)),
+        result("export_json_build", params, measure(lambda: build_export("bench", index, "json"), repeat=3 if slow else 10)),
+        result("export_cached", params, measure(lambda: get_export("bench", schedule, "ics"), repeat=5, number=1000)),
+    ]
+
+
+def retained_bytes(build):
+    """Bytes still allocated by ``build()``'s result after it returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(rows):
+    """Resident size of one section as a DataFrame vs. as a table plus index, per 10k rows.
+
+    ``pool_bytes_per_10k`` is what the section's strings add to the shared
+    pools the first time they are seen; ``table_bytes_per_10k`` is the cost
+    of the table and index themselves, paid by every section.
+    """
+    import pandas as pd
+
+    text = synthetic_schedule(rows, seed=rows).to_csv(index=False)
+    frame = pd.read_csv(io.StringIO(text))
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+
+    def build():
+        table = ScheduleTable.from_frame(frame)
+        return table, ScheduleIndex(table)
+
+    first_bytes, _ = retained_bytes(build)
+    table_bytes, (table, _) = retained_bytes(build)
+    per_10k = 10_000 / rows
+    return [result(
+        "memory", {"rows": rows}, measure(lambda: ScheduleTable.from_frame(frame), repeat=3),
+        dataframe_bytes_per_10k=round(frame_bytes * per_10k),
+        table_bytes_per_10k=round(table_bytes * per_10k),
+        pool_bytes_per_10k=round((first_bytes - table_bytes) * per_10k),
+        table_nbytes_per_10k=round(table.nbytes() * per_10k),
+    )]
+
+
+def bench_gradebook(students):
+    import gpa_batch
+
+    gradebook = synthetic_gradebook(students)
+    results = [result("batch_gpa", {"students": students}, measure(lambda: gpa_batch.batch_gpa(gradebook), repeat=3))]
+    if students <= 1_000:
+        results.append(result("target_plans", {"students": students}, measure(lambda: gpa_batch.target_plans(gradebook, 3.0), repeat=1)))
+    return results
+
+
+def bench_department(sections, rows_per_section):
+    from availability import AvailabilityIndex
+    from conflicts import find_conflicts
+    from department import Department
+
+    frames = synthetic_department(sections, rows_per_section, clashes=25)
+    department = Department({name: Schedule(name, None, ScheduleTable.from_frame(frame)) for name, frame in frames.items()})
+    params = {"sections": sections, "rows": sections * rows_per_section}
+    availability = AvailabilityIndex(department)
+    teacher = availability.teacher_names()[0]
+    return [
+        result("conflicts", params, measure(lambda: find_conflicts(department), repeat=3)),
+        result("availability_build", params, measure(lambda: AvailabilityIndex(department), repeat=3)),
+        result("free_venues", params, measure(lambda: availability.free_venues("Tuesday", 600, 660))),
+        result("teacher_free", params, measure(lambda: availability.teacher_free(teacher))),
+    ]
+
+
+def bench_compiled(sections, rows_per_section):
+    """Loading every section from CSVs vs. mapping one compiled file."""
+    from schedule_compiled import CompiledRegistry, compile_tables
+    from schedule_store import ScheduleStore
+    from section_registry import SectionRegistry
+
+    params = {"sections": sections, "rows": sections * rows_per_section}
+    with tempfile.TemporaryDirectory() as directory:
+        write_sections(directory, sections, rows_per_section)
+        compiled_path = os.path.join(directory, "schedules.bin")
+        paths = SectionRegistry(directory).sections()
+
+        def compile_all():
+            compile_tables({name: ScheduleTable.from_csv(path) for name, path in paths.items()}, compiled_path)
+
+        def parse_all():
+            registry = SectionRegistry(directory, ScheduleStore(max_entries=sections))
+            for name in registry.names():
+                registry.get(name)
+
+        def map_all():
+            registry = CompiledRegistry(compiled_path)
+            for name in registry.names():
+                registry.get(name)
+
+        compile_seconds = measure(compile_all, repeat=1)
+        return [
+            result("compile_all", params, compile_seconds, file_bytes=os.path.getsize(compiled_path)),
+            result("load_all_csv", params, measure(parse_all, repeat=3)),
+            result("load_all_compiled", params, measure(map_all, repeat=3)),
+        ]
+
+
+def bench_watch(rows):
+    """An edit to one day: the watcher's diffed reload vs. a session reparsing it."""
+    from schedule_index import DAY_ORDER
+    from schedule_render import day_html
+    from schedule_store import ScheduleStore
+    from schedule_watch import ScheduleWatcher
+    from section_registry import SectionRegistry
+
+    params = {"rows": rows}
+    with tempfile.TemporaryDirectory() as directory:
+        write_sections(directory, 1, rows)
+        registry = SectionRegistry(directory, ScheduleStore())
+        name = registry.names()[0]
+        path = registry.path(name)
+        with open(path) as f:
+            header, first, *rest = f.read().splitlines()
+        edits = iter(range(10**9))
+
+        def edit():
+            # Rename the week's first class; only its day changes
+            fields = first.split(",")
+            fields[3] = f"Edited {next(edits)}"
+            with open(path, "w") as f:
+                f.write("\n".join([header, ",".join(fields)] + rest) + "\n")
+
+        def render_week():
+            schedule = registry.get(name)
+            for day in DAY_ORDER:
+                day_html(schedule, day)
+
+        render_week()
+        watcher = ScheduleWatcher(registry)
+        watcher.poll()
+
+        def edit_and_poll():
+            edit()
+            watcher.poll()
+
+        # What the session pays on its next rerun after the edit, with the
+        # watcher having reloaded the file and without it
+        return [
+            result("watch_poll_edit", params, measure(edit_and_poll, repeat=5)),
+            result("watch_rerender_week", params, measure(render_week, repeat=5, setup=edit_and_poll)),
+            result("reload_rerender_week", params, measure(render_week, repeat=5, setup=edit)),
+        ]
+
+
+def bench_notices(items):
+    """A section's notices: the cached HTML vs. querying and rendering each rerun."""
+    from notices import NoticeStore, render
+
+    params = {"items": items}
+    with tempfile.TemporaryDirectory() as directory:
+        notices = NoticeStore(os.path.join(directory, "notices.db"))
+        with closing(notices.connect()) as db, db:
+            db.executemany(
+                "INSERT INTO items (section, kind, body, due, expires) VALUES (?, ?, ?, ?, ?)",
+                [(f"SEC-{i % 500:04d}", "notice" if i % 3 else "assignment", f"Item {i}", 2_000_000_000 + i, 2_000_000_000 + i)
+                 for i in range(items)],
+            )
+        notices.section_html("SEC-0000")
+        return [
+            result("notices_query_render", params, measure(lambda: render("SEC-0000", notices.items("SEC-0000")), number=100)),
+            result("notices_cached", params, measure(lambda: notices.section_html("SEC-0000"), number=100)),
+        ]
+
+
+def run(quick=False):
+    results = bench_marks() + bench_gpa_form()
+    for rows in QUICK_ROW_COUNTS if quick else ROW_COUNTS:
+        results += bench_schedule(rows)
+    for rows in [10_000] if quick else [1_000, 10_000, 100_000]:
+        results += bench_memory(rows)
+    for students in [1_000] if quick else [1_000, 10_000, 100_000]:
+        results += bench_gradebook(students)
+    for sections, rows in [(10, 100)] if quick else [(10, 100), (100, 100), (500, 200)]:
+        results += bench_department(sections, rows)
+        results += bench_compiled(sections, rows)
+    for rows in [1_000] if quick else [1_000, 10_000, 100_000]:
+        results += bench_watch(rows)
+    for items in [1_000] if quick else [1_000, 100_000]:
+        results += bench_notices(items)
+    return results
+
+
+if __name__ == "__main__":
+    write_report(run(quick="--quick" in sys.argv))
@@ -0,0 +1,73 @@
+"""Cold-start import cost of the schedule view, before and after dropping pandas/pytz.
+
+    python -m benchmarks.bench_imports [--quick]
+
+Each measurement is a fresh interpreter, so nothing is already imported
+(the OS file cache is warm after the first run, as on a container that has
+just started).
+"""
+
+import ast
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import measure, result, write_report
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def top_level_imports(path):
+    """An import statement for every module ``path`` imports at module level.
+
+    Imports inside functions or branches (pandas for the GPA tools, numpy
+    for the week grid) are left out, as they don't run on a cold start.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules += [name for name in names if name not in modules]
+    return "import " + ", ".join(modules)
+
+
+# What app.py imports now on every start, and what it imported before
+SCHEDULE_VIEW = top_level_imports(os.path.join(APP_DIR, "app.py"))
+LEGACY = "import streamlit, pandas, pytz"
+
+CASES = {
+    "baseline": "pass",
+    "streamlit": "import streamlit",
+    "schedule_view": SCHEDULE_VIEW,
+    "legacy_pandas_pytz": LEGACY,
+    "gpa_batch": "import gpa_batch",
+    "week_grid": "import week_grid",
+}
+
+
+def import_seconds(statement):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], cwd=APP_DIR, check=True)
+    return time.perf_counter() - started
+
+
+def run(quick=False):
+    repeat = 3 if quick else 7
+    # One unmeasured run of each, so every case sees a warm file cache
+    for statement in CASES.values():
+        import_seconds(statement)
+    return [
+        result(f"import_{name}", {"statement": statement}, measure(lambda: import_seconds(statement), repeat=repeat))
+        for name, statement in CASES.items()
+    ]
+
+
+if __name__ == "__main__":
+    write_report(run(quick="--quick" in sys.argv))
@@ -0,0 +1,68 @@
+"""Microbenchmark: DataFrame now/next scan vs. the precompiled bisect index.
+
+    python -m benchmarks.bench_now_next [rows ...]
+"""
+
+import sys
+import timeit
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synth import synthetic_schedule
+from schedule_index import ScheduleIndex, minute_of_week
+from schedule_table import ScheduleTable
+
+
+def legacy_now_next(schedule, now):
+    """The filter/parse/sort/iterrows lookup app.py used before the index."""
+    today = now.strftime("%A")
+    current_time_obj = now.time()
+    today_schedule = schedule[schedule["Day"] == today].copy()
+    current_class = None
+    next_class = None
+    if not today_schedule.empty:
+        today_schedule["start_time_obj"] = pd.to_datetime(today_schedule["Start_Time"], format="%H:%M").dt.time
+        today_schedule["end_time_obj"] = pd.to_datetime(today_schedule["End_Time"], format="%H:%M").dt.time
+        today_schedule = today_schedule.sort_values(by="start_time_obj")
+        for _, row in today_schedule.iterrows():
+            if row["start_time_obj"] <= current_time_obj <= row["end_time_obj"]:
+                current_class = row
+            elif row["start_time_obj"] > current_time_obj and next_class is None:
+                next_class = row
+    return current_class, next_class
+
+
+def run(sizes):
+    # A Wednesday mid-morning: the busiest part of the synthetic week
+    now = datetime(2025, 9, 10, 10, 30)
+    results = []
+    for rows in sizes:
+        frame = synthetic_schedule(rows)
+        index = ScheduleIndex(ScheduleTable.from_frame(frame))
+        minute = minute_of_week(now)
+
+        legacy_runs = 3 if rows >= 10_000 else 20
+        legacy = min(timeit.repeat(lambda: legacy_now_next(frame, now), number=1, repeat=legacy_runs))
+        bisect = min(timeit.repeat(lambda: index.now_next(minute), number=1000, repeat=5)) / 1000
+        build = min(timeit.repeat(lambda: ScheduleIndex(ScheduleTable.from_frame(frame)), number=1, repeat=3))
+        results.append({
+            "rows": rows,
+            "legacy_s": legacy,
+            "index_s": bisect,
+            "index_build_s": build,
+            "speedup": legacy / bisect,
+        })
+    return results
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [10, 100, 1_000, 10_000, 100_000]
+    print(f"{'rows':>8} {'legacy':>12} {'bisect':>12} {'build once':>12} {'speedup':>10}")
+    for r in run(sizes):
+        print(f"{r['rows']:>8} {r['legacy_s'] * 1e3:>10.3f}ms {r['index_s'] * 1e6:>10.2f}us "
+              f"{r['index_build_s'] * 1e3:>10.1f}ms {r['speedup']:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
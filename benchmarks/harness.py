@@ -0,0 +1,61 @@
+"""Timing helpers and the machine-readable result format shared by the benchmarks."""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure(fn, repeat=5, number=1, setup=None):
+    """Time ``fn`` and return per-call seconds as {min, median, p95, max, runs}.
+
+    ``setup``, if given, runs untimed before each sample.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    samples.sort()
+    return {
+        "min": samples[0],
+        "median": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+        "max": samples[-1],
+        "runs": repeat * number,
+    }
+
+
+def result(bench, params, seconds, **extra):
+    """One benchmark result record."""
+    return dict({"bench": bench, "params": params, "seconds": seconds}, **extra)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.time(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def write_report(results, path=None):
+    """Write ``{"meta": ..., "results": [...]}`` as JSON to ``path`` (stdout if None)."""
+    report = json.dumps({"meta": metadata(), "results": results}, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
@@ -0,0 +1,365 @@
+"""Concurrent-session load test of app.py over Streamlit's websocket protocol.
+
+    python -m benchmarks.load_test [--sessions 1,5,10,25] [--duration 20] [--synthetic 100x1000] [--out load.json]
+
+Starts ``streamlit run app.py`` on a free local port (headless, XSRF off,
+no file watcher) and, for each N in ``--sessions``, keeps N simulated
+browser sessions busy for ``--duration`` seconds. Each session connects to
+``/_stcore/stream`` as the browser does, then repeatedly either picks
+another ``section_selector`` option or submits ``gpa_form`` with random
+marks, pausing a random think time in between. Widget ids are read from
+the deltas the server sends, so the sessions follow whatever the app
+renders.
+
+For every N the report has rerun latency percentiles (send to
+``script_finished``), overall and per action, reruns per second, errors,
+and the server's CPU use and peak RSS during the step: a capacity curve to
+size replicas against. CPU and RSS come from ``/proc`` and are None
+elsewhere. Fragment timers (the status box) are not driven; they fire at
+class boundaries, far apart compared with a run.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from benchmarks.harness import result, write_report
+from benchmarks.synth import synthetic_marks
+from gpa import input_key, subjects_data
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(APP_DIR, "app.py")
+
+GPA_SECTION = "GPA Calc"
+RERUN_TIMEOUT = 120
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, env=None):
+    """Start app.py with ``streamlit run`` and wait until it answers its health check."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.enableXsrfProtection", "false",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=APP_DIR,
+        env=dict(os.environ, **(env or {})),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("streamlit did not start within 60 s")
+
+
+class ProcessStats:
+    """CPU seconds and RSS of a process, read from ``/proc`` (None where unavailable)."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def cpu_seconds(self):
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                # Fields after the parenthesised command name; utime and stime are 14 and 15
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            return None
+        return (int(fields[11]) + int(fields[12])) / self.tick
+
+    def rss_bytes(self):
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+
+
+class Session:
+    """One simulated browser tab on the app's websocket."""
+
+    def __init__(self, url, origin):
+        self.url = url
+        self.origin = origin
+        self.ws = None
+        # widget id -> element proto (radio, selectbox, text_input, button...)
+        self.widgets = {}
+        self.section = None
+
+    async def connect(self):
+        self.ws = await websockets.connect(
+            self.url, subprotocols=["streamlit"], origin=self.origin, max_size=None, ping_interval=None
+        )
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def widget(self, key):
+        suffix = "-" + key
+        for widget_id, element in self.widgets.items():
+            if widget_id.endswith(suffix):
+                return widget_id, element
+        return None, None
+
+    def section_options(self):
+        _, element = self.widget("section_selector")
+        return list(element.options) if element is not None else []
+
+    async def rerun(self, states=()):
+        """Rerun the script with ``states`` [(widget id, field, value)]; returns (seconds, ok)."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        for widget_id, field, value in states:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            setattr(state, field, value)
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets = {}
+        ok = True
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT))
+            kind = reply.WhichOneof("type")
+            if kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element = reply.delta.new_element
+                name = element.WhichOneof("type")
+                if name == "exception":
+                    ok = False
+                widget_id = getattr(getattr(element, name), "id", "") if name else ""
+                if isinstance(widget_id, str) and widget_id:
+                    widgets[widget_id] = getattr(element, name)
+            elif kind == "script_finished":
+                status = reply.script_finished
+                if status in (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR):
+                    break
+        seconds = time.perf_counter() - started
+        self.widgets = widgets
+        return seconds, ok and status == ForwardMsg.FINISHED_SUCCESSFULLY
+
+    async def open(self, section):
+        """Load the page with ``section`` selected (the first load picks the default)."""
+        if self.section is None:
+            seconds, ok = await self.rerun()
+            options = self.section_options()
+            self.section = options[0] if options else None
+            if section is None or section == self.section:
+                return seconds, ok
+        widget_id, _ = self.widget("section_selector")
+        seconds, ok = await self.rerun([(widget_id, "string_value", section)])
+        self.section = section
+        return seconds, ok
+
+    async def submit_marks(self, rng):
+        """Fill every gpa_form field with random marks and press Calculate GPA."""
+        selector, _ = self.widget("section_selector")
+        states = [(selector, "string_value", GPA_SECTION)]
+        for sub in subjects_data:
+            for comp, _ in sub["components"]:
+                widget_id, _ = self.widget(input_key(sub["name"], comp))
+                if widget_id is not None:
+                    states.append((widget_id, "string_value", synthetic_marks(rng)))
+        submit = next(
+            (widget_id for widget_id, element in self.widgets.items()
+             if getattr(element, "is_form_submitter", False) and element.form_id == "gpa_form"),
+            None,
+        )
+        if submit is None:
+            return None, False
+        states.append((submit, "trigger_value", True))
+        return await self.rerun(states)
+
+
+async def drive(session, deadline, think, rng, samples):
+    """Keep one session switching sections and submitting marks until ``deadline``."""
+    while time.monotonic() < deadline:
+        options = session.section_options()
+        if session.section == GPA_SECTION and rng.random() < 0.5:
+            action, (seconds, ok) = "gpa_submit", await session.submit_marks(rng)
+        else:
+            others = [name for name in options if name != session.section] or options
+            action, (seconds, ok) = "switch", await session.open(rng.choice(others))
+        if seconds is not None:
+            samples.append((action, seconds, ok))
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+
+async def sample_rss(stats, peak, stop):
+    while not stop.is_set():
+        rss = stats.rss_bytes()
+        if rss is not None:
+            peak[0] = max(peak[0] or 0, rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.25)
+        except asyncio.TimeoutError:
+            pass
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return None
+
+    def at(q):
+        return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))]
+
+    return {
+        "min": samples[0],
+        "median": at(0.5),
+        "p90": at(0.9),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": samples[-1],
+        "runs": len(samples),
+    }
+
+
+async def load_step(port, stats, sessions, duration, think, seed):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    origin = f"http://127.0.0.1:{port}"
+    samples = []
+    clients = [Session(url, origin) for _ in range(sessions)]
+    stop = asyncio.Event()
+    peak = [None]
+    sampler = asyncio.create_task(sample_rss(stats, peak, stop))
+    cpu_before = stats.cpu_seconds()
+    started = time.monotonic()
+    try:
+        # Connections are staggered over a second, as students don't arrive in lockstep
+        async def session_task(i, client):
+            rng = random.Random(seed * 1_000_003 + i)
+            await asyncio.sleep(i / sessions)
+            await client.connect()
+            seconds, ok = await client.open(None)
+            samples.append(("load", seconds, ok))
+            await drive(client, started + duration, think, rng, samples)
+
+        outcomes = await asyncio.gather(
+            *(session_task(i, client) for i, client in enumerate(clients)), return_exceptions=True
+        )
+    finally:
+        stop.set()
+        await sampler
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+    elapsed = time.monotonic() - started
+    cpu_after = stats.cpu_seconds()
+
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    reruns = [seconds for _, seconds, _ in samples]
+    by_action = {}
+    for action, seconds, _ in samples:
+        by_action.setdefault(action, []).append(seconds)
+    cpu = None if cpu_before is None or cpu_after is None else cpu_after - cpu_before
+    return result(
+        "load_rerun",
+        {"sessions": sessions, "duration": duration, "think": think},
+        percentiles(reruns),
+        actions={action: percentiles(values) for action, values in sorted(by_action.items())},
+        reruns_per_second=len(reruns) / elapsed,
+        errors=sum(not ok for _, _, ok in samples) + len(failures),
+        failures=sorted({f"{type(e).__name__}: {e}" for e in failures}),
+        cpu_seconds=cpu,
+        cpu_percent=None if cpu is None else 100 * cpu / elapsed,
+        rss_peak_bytes=peak[0],
+        rss_end_bytes=stats.rss_bytes(),
+    )
+
+
+def summary_line(record):
+    seconds = record["seconds"] or {}
+
+    def ms(key):
+        return f"{seconds[key] * 1000:8.1f}" if key in seconds else "       -"
+
+    cpu = record["cpu_percent"]
+    rss = record["rss_peak_bytes"]
+    return (
+        f"{record['params']['sessions']:>8} {ms('median')} {ms('p95')} {ms('p99')} "
+        f"{record['reruns_per_second']:8.1f} {record['errors']:6} "
+        f"{'-' if cpu is None else f'{cpu:.0f}%':>6} {'-' if rss is None else f'{rss / 2**20:.0f} MB':>8}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="comma-separated session counts to step through")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load at each step")
+    parser.add_argument("--think", type=float, default=1.0, help="mean pause between a session's actions, in seconds")
+    parser.add_argument("--synthetic", metavar="SECTIONSxROWS",
+                        help="serve synthetic sections (e.g. 100x1000) instead of the real schedules")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    env = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if args.synthetic:
+            from benchmarks.synth import write_sections
+
+            sections, rows = (int(n) for n in args.synthetic.lower().split("x"))
+            write_sections(directory, sections, rows, seed=args.seed)
+            env["SCHEDULE_DIR"] = directory
+
+        port = free_port()
+        server = start_server(port, env)
+        stats = ProcessStats(server.pid)
+        results = []
+        try:
+            print(f"{'sessions':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rerun/s':>8} {'errors':>6} {'cpu':>6} {'rss':>8}",
+                  file=sys.stderr)
+            for sessions in (int(n) for n in args.sessions.split(",")):
+                record = asyncio.run(load_step(port, stats, sessions, args.duration, args.think, args.seed))
+                results.append(record)
+                print(summary_line(record), file=sys.stderr)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    write_report(results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Run every benchmark and write one JSON report.
+
+    python -m benchmarks.run [--quick] [--out results.json]
+
+Compare reports from two commits to catch regressions before deploying a
+new schedule format.
+"""
+
+import argparse
+
+from benchmarks import bench_app, bench_functions, bench_imports
+from benchmarks.harness import write_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small sizes only, for a fast smoke run")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--skip-app", action="store_true", help="only run the pure-function microbenchmarks")
+    args = parser.parse_args(argv)
+
+    results = bench_functions.run(quick=args.quick)
+    results += bench_imports.run(quick=args.quick)
+    if not args.skip_app:
+        results += bench_app.run(quick=args.quick)
+    write_report(results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Synthetic timetables and gradebooks for benchmarks."""
+
+import os
+import random
+
+import pandas as pd
+
+from gpa import input_key, subjects_data
+from schedule_index import DAY_ORDER
+
+COLUMNS = ["Day", "Start_Time", "End_Time", "Course", "Teacher", "Venue"]
+
+
+def synthetic_schedule(rows, seed=0, days=DAY_ORDER[:5]):
+    """Return a DataFrame of ``rows`` random classes in the section CSV format.
+
+    Classes start on 5-minute marks between 08:00 and 17:00 and last 45-165
+    minutes, so large timetables contain plenty of overlaps.
+    """
+    rng = random.Random(seed)
+    records = []
+    for _ in range(rows):
+        start = rng.randrange(8 * 60, 17 * 60, 5)
+        end = start + rng.choice([45, 50, 90, 105, 135, 165])
+        records.append({
+            "Day": rng.choice(days),
+            "Start_Time": f"{start // 60}:{start % 60:02d}",
+            "End_Time": f"{end // 60}:{end % 60:02d}",
+            "Course": f"Course {rng.randrange(max(rows // 4, 1))}",
+            "Teacher": f"Teacher {rng.randrange(max(rows // 8, 1))}",
+            "Venue": f"C-{rng.randrange(max(rows // 6, 1))}",
+        })
+    return pd.DataFrame.from_records(records, columns=COLUMNS)
+
+
+def synthetic_department(sections, rows_per_section, clashes=0, seed=0):
+    """Return {section: DataFrame} with no teacher or venue double-bookings except ``clashes`` injected ones.
+
+    Every teacher and every room gets 40 distinct one-hour weekday slots, like
+    a real, clean timetable; each injected clash moves one class onto another
+    class's teacher at the same time.
+    """
+    rng = random.Random(seed)
+    frames = {}
+    for i in range(sections):
+        records = []
+        for j in range(rows_per_section):
+            g = i * rows_per_section + j
+            day, slot = (g % 40) % 5, (g % 40) // 5
+            start = 8 * 60 + slot * 60
+            records.append({
+                "Day": DAY_ORDER[day],
+                "Start_Time": f"{start // 60}:00",
+                "End_Time": f"{start // 60}:50",
+                "Course": f"Course {g % 97}",
+                "Teacher": f"Teacher {g // 40}",
+                "Venue": f"Room {(g // 40 + 13) % max(sections * rows_per_section // 40, 1)}-{g // 40}",
+            })
+        frames[f"SEC-{i + 1:04d}"] = pd.DataFrame.from_records(records, columns=COLUMNS)
+    names = list(frames)
+    for _ in range(clashes):
+        a, b = rng.sample(names, 2) if len(names) > 1 else (names[0], names[0])
+        ra, rb = rng.randrange(rows_per_section), rng.randrange(rows_per_section)
+        frames[b].loc[rb, ["Day", "Start_Time", "End_Time", "Teacher"]] = frames[a].loc[ra, ["Day", "Start_Time", "End_Time", "Teacher"]].values
+    return frames
+
+
+def write_sections(directory, sections, rows_per_section, seed=0):
+    """Write ``sections`` synthetic section CSVs into ``directory``.
+
+    Files are named ``SEC-0001.csv`` and so on, so the directory can be used
+    as ``SCHEDULE_DIR``. Returns the section names in order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for i in range(sections):
+        name = f"SEC-{i + 1:04d}"
+        synthetic_schedule(rows_per_section, seed=seed + i).to_csv(os.path.join(directory, f"{name}.csv"), index=False)
+        names.append(name)
+    return names
+
+
+def synthetic_marks(rng):
+    """One component's entry: blank a quarter of the time, otherwise "x/total"."""
+    if rng.random() < 0.25:
+        return ""
+    total = rng.choice([5, 10, 15, 20, 25, 50, 100])
+    return f"{rng.randint(0, total)}/{total}"
+
+
+def synthetic_gradebook(students, seed=0, subjects=subjects_data):
+    """A gradebook shaped like ``subjects_data``: a Student column plus one column per component."""
+    rng = random.Random(seed)
+    columns = {"Student": [f"ST-{i:06d}" for i in range(students)]}
+    for sub in subjects:
+        for comp, _ in sub["components"]:
+            columns[input_key(sub["name"], comp)] = [synthetic_marks(rng) for _ in range(students)]
+    return pd.DataFrame(columns)
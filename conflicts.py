@@ -0,0 +1,152 @@
+"""Cross-section teacher and venue clash detection.
+
+Every class in the department (see ``department.py``) is a minute-of-week
+interval, grouped by teacher and by venue. Each group is swept in start
+order with a heap of the classes still running. Overlapping classes are
+gathered into one clash per run of overlaps, with the number of clashing
+pairs in it, so a placeholder teacher like "TBA" shared by a thousand
+classes is one record of a thousand bookings, not half a million pairs.
+The whole department is checked in O(n log n).
+
+Names are compared loosely ("Dr.Shahzad" and "Dr. Shahzad" are the same
+teacher). The same course with the same teacher in the same room at the
+same time in two sections is a combined class, not a clash.
+"""
+
+import heapq
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+from itertools import groupby
+
+from schedule_index import DAY_ORDER, MINUTES_PER_DAY
+from schedule_table import POOLS
+
+# One class taking part in a clash
+Booking = namedtuple("Booking", ["section", "row", "start", "end"])
+
+# A run of overlapping classes sharing a teacher or venue: ``kind`` is
+# "teacher" or "venue", ``resource`` the name as written in the first
+# booking, ``bookings`` every class in the run in start order and ``pairs``
+# how many pairs of them overlap without being a combined class
+Conflict = namedtuple("Conflict", ["kind", "resource", "bookings", "pairs"])
+
+# Clashes listed in full on a section's page; the rest are counted
+SHOWN_CONFLICTS = 20
+# Bookings named per clash
+SHOWN_BOOKINGS = 6
+
+
+_NOT_ALNUM = re.compile(r"[^0-9a-z]")
+
+
+@lru_cache(maxsize=65536)
+def resource_key(name):
+    """Normalize a teacher or venue name for comparison."""
+    return _NOT_ALNUM.sub("", str(name).casefold())
+
+
+def is_combined_class(a, b):
+    return (
+        a.start == b.start
+        and a.end == b.end
+        and resource_key(a.row["Course"]) == resource_key(b.row["Course"])
+        and resource_key(a.row["Teacher"]) == resource_key(b.row["Teacher"])
+        and resource_key(a.row["Venue"]) == resource_key(b.row["Venue"])
+    )
+
+
+def combined_key(booking):
+    row = booking.row
+    return (booking.start, booking.end, resource_key(row["Course"]), resource_key(row["Teacher"]), resource_key(row["Venue"]))
+
+
+def clash(kind, run, booking):
+    """The ``Conflict`` for one run of overlapping (start, end, class number) tuples, or None."""
+    overlaps = 0
+    active = []
+    for start, end, _ in run:
+        while active and active[0] <= start:
+            heapq.heappop(active)
+        overlaps += len(active)
+        heapq.heappush(active, end)
+    bookings = [booking(n) for _, _, n in run]
+    # Copies of one combined class overlap each other but don't clash
+    combined = sum(
+        count * (count - 1) // 2
+        for key, count in Counter(map(combined_key, bookings)).items()
+        if key[1] > key[0]
+    )
+    if overlaps == combined:
+        return None
+    return Conflict(kind, bookings[0].row[kind.capitalize()], bookings, overlaps - combined)
+
+
+def overlap_runs(intervals):
+    """Split (start, end, class number) tuples, sorted by start, into runs of overlapping classes."""
+    run = []
+    latest = None
+    for start, end, n in intervals:
+        # [start, end): a class starting as the run's last one ends is clear of it
+        if run and start >= latest:
+            yield run
+            run = []
+        latest = end if not run else max(latest, end)
+        run.append((start, end, n))
+    if run:
+        yield run
+
+
+def sweep(intervals, booking, kind):
+    """Yield a ``Conflict`` for every run of overlapping ``intervals`` with a clash in it.
+
+    ``intervals`` are (resource key, start, end, class number) tuples;
+    ``booking(n)`` builds the ``Booking`` for class number n. Bookings are
+    only built for classes in a run of two or more.
+    """
+    for _, group in groupby(sorted(intervals), key=lambda interval: interval[0]):
+        for run in overlap_runs(interval[1:] for interval in group):
+            if len(run) > 1:
+                conflict = clash(kind, run, booking)
+                if conflict is not None:
+                    yield conflict
+
+
+def find_conflicts(department):
+    """Return every teacher and venue clash in a ``department.Department``."""
+    rows, starts, ends = department.rows, department.starts, department.ends
+
+    def booking(n):
+        return Booking(department.section(n), rows[n], starts[n], ends[n])
+
+    def intervals(column):
+        codes = department.codes[column]
+        names = POOLS[column].values
+        keys = {code: resource_key(names[code]) for code in set(codes)}
+        # A blank cell is missing data, not a resource every blank shares
+        return [(keys[code], s, e, n) for n, (code, s, e) in enumerate(zip(codes, starts, ends)) if keys[code]]
+
+    return list(sweep(intervals("Teacher"), booking, "teacher")) + list(sweep(intervals("Venue"), booking, "venue"))
+
+
+def get_conflicts(department):
+    """The department's clash list, computed once per department version."""
+    return department.derive("conflicts", find_conflicts)
+
+
+def for_section(conflicts, section):
+    return [c for c in conflicts if any(b.section == section for b in c.bookings)]
+
+
+def describe(conflict, section=None):
+    """One-line markdown description of a clash, naming ``section``'s classes first."""
+    other = "Venue" if conflict.kind == "teacher" else "Teacher"
+    bookings = sorted(conflict.bookings, key=lambda b: b.section != section)
+    day = DAY_ORDER[bookings[0].start // MINUTES_PER_DAY]
+    shown = ", ".join(
+        f"{b.section} {b.row['Course']} ({b.row['Start_Time']}-{b.row['End_Time']}, {b.row[other]})"
+        for b in bookings[:SHOWN_BOOKINGS]
+    )
+    more = f" and {len(bookings) - SHOWN_BOOKINGS} more" if len(bookings) > SHOWN_BOOKINGS else ""
+    pairs = "1 clash" if conflict.pairs == 1 else f"{conflict.pairs:,} clashing pairs"
+    return f"**{conflict.kind.capitalize()} {conflict.resource}** on {day}, {pairs}: {shown}{more}"
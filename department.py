@@ -0,0 +1,132 @@
+"""Every class in every section, flattened into one table.
+
+Cross-section features (clash detection, free rooms and teachers) need the
+whole department at once. ``DepartmentView`` builds that table from the
+section registry and rebuilds it only when a section file changes;
+features hang their own indexes off it with ``derive`` so they are
+rebuilt exactly once per department version.
+
+The table keeps only typed columns (section id, day, bounds and string
+pool codes, about 30 bytes a class), not the sections' parsed schedules,
+so it doesn't hold every section in memory beside the store's LRU.
+"""
+
+import csv
+import threading
+import time
+from array import array
+from itertools import repeat
+
+from schedule_table import POOLS, TEXT_COLUMNS, Rows
+
+
+class Department:
+    """Per-class columns across all sections, in section order.
+
+    Class ``n`` belongs to section ``section_names[section_ids[n]]`` and
+    occupies minute-of-week [``starts[n]``, ``ends[n]``); ``codes[column][n]``
+    is its pool code in each text column, and ``rows[n]`` a ``Row`` view of
+    it like a section's own. ``unreadable`` maps each section that could not
+    be parsed to the reason.
+    """
+
+    def __init__(self, schedules=None, versions=None):
+        self.versions = versions
+        self.section_names = []
+        self.unreadable = {}
+        self.section_ids = array("I")
+        self.days = array("b")
+        self.starts = array("h")
+        self.ends = array("h")
+        self.codes = {column: array("I") for column in TEXT_COLUMNS}
+        self.rows = Rows(self)
+        for section, schedule in (schedules or {}).items():
+            self.add(section, schedule.table)
+        self.derived = {}
+        self._lock = threading.Lock()
+
+    def add(self, section, table):
+        """Append a section's ``ScheduleTable``; the table itself isn't kept."""
+        self.section_ids.extend(repeat(len(self.section_names), len(table)))
+        self.section_names.append(section)
+        self.days.extend(table.days)
+        self.starts.extend(table.starts)
+        self.ends.extend(table.ends)
+        for column in TEXT_COLUMNS:
+            self.codes[column].extend(table.pool_codes(column))
+
+    def section(self, n):
+        return self.section_names[self.section_ids[n]]
+
+    def text(self, column, n):
+        return POOLS[column].values[self.codes[column][n]]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def derive(self, key, build):
+        """Return ``derived[key]``, computing it with ``build(self)`` on first use."""
+        value = self.derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self.derived.get(key)
+                if value is None:
+                    started = time.perf_counter()
+                    value = build(self)
+                    self.derived[key] = value
+                    self.derived[(key, "seconds")] = time.perf_counter() - started
+        return value
+
+
+class DepartmentView:
+    """The current ``Department`` for a registry.
+
+    File versions are re-checked at most every ``check_interval`` seconds,
+    so a rerun normally costs a clock read.
+    """
+
+    def __init__(self, registry, check_interval=30):
+        self.registry = registry
+        self.check_interval = check_interval
+        self._department = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._department is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._department
+        with self._lock:
+            if self._department is None or time.monotonic() - self._checked_at >= self.check_interval:
+                versions = self.registry.versions()
+                if self._department is None or versions != self._department.versions:
+                    department = Department(versions=versions)
+                    for name in versions:
+                        # cache=False: scanning the department must not evict
+                        # the sections students are viewing from the store's LRU
+                        try:
+                            table = self.registry.get(name, cache=False).table
+                        except FileNotFoundError:
+                            # Removed since the listing
+                            continue
+                        except (OSError, ValueError, csv.Error) as e:
+                            # One bad file (not UTF-8, half-saved) mustn't take
+                            # every section's page down with it
+                            department.unreadable[name] = str(e)
+                            continue
+                        department.add(name, table)
+                    self._department = department
+                self._checked_at = time.monotonic()
+        return self._department
+
+
+_views = {}
+_views_lock = threading.Lock()
+
+
+def get_department(registry):
+    """Return the current ``Department`` for ``registry`` (shared process-wide)."""
+    view = _views.get(registry)
+    if view is None:
+        with _views_lock:
+            view = _views.setdefault(registry, DepartmentView(registry))
+    return view.get()
@@ -0,0 +1,34 @@
+"""Re-arming a fragment's auto-rerun timer from inside the fragment.
+
+``st.fragment(run_every=...)`` only sends its timer to the browser when the
+full script declares the fragment; reruns of the fragment itself keep the
+first interval. The status box wants to fire at irregular class
+boundaries, so after each run it resends the timer with the delay to the
+next boundary. This uses Streamlit internals (as of the lowest version allowed by
+requirements.txt) and quietly does nothing if they have changed, leaving
+the fragment on its original interval.
+"""
+
+
+def rearm(seconds):
+    """Make the currently running fragment rerun ``seconds`` from now (and every ``seconds`` after).
+
+    Returns False when not running inside a fragment or the internals have moved.
+    """
+    try:
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ThreadState, get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        fragment_id = ThreadState.get().fragment_id
+        if ctx is None or fragment_id is None:
+            return False
+
+        msg = ForwardMsg()
+        msg.auto_rerun.interval = seconds
+        msg.auto_rerun.fragment_id = fragment_id
+        ctx.enqueue(msg)
+    except (ImportError, AttributeError, RuntimeError):
+        # Renamed modules or fields, or no session to send to
+        return False
+    return True
@@ -0,0 +1,168 @@
+"""GPA calculator rules: subject weights, mark parsing and the grade scale.
+
+Shared by the interactive calculator in ``app.py`` and the batch engine in
+``gpa_batch.py`` so both always grade the same way.
+"""
+
+from collections import namedtuple
+
+# Helper function to parse "x/y" string
+def get_score_percentage(entry):
+    if not entry:
+        return None
+    try:
+        if "/" in entry:
+            obtained, total = map(float, entry.split('/'))
+            return obtained / total
+        else:
+            # Fallback if user just types a number (assume out of 10 or 100? Safest to ignore or treat as raw)
+            # To stick to instructions, we expect x/x
+            return None
+    except (ValueError, ZeroDivisionError):
+        return None
+
+# Grade scale (Standard 4.0 scale assumption): minimum percentage -> grade point
+GRADE_STEPS = [
+    (85, 4.0), (80, 3.67), (75, 3.33), (70, 3.0), (67, 2.67), (64, 2.33),
+    (60, 2.0), (57, 1.67), (54, 1.33), (50, 1.0),
+]
+
+# Helper to convert percentage to Grade Point
+def pct_to_gp(pct):
+    for threshold, gp in GRADE_STEPS:
+        if pct >= threshold:
+            return gp
+    return 0.0
+
+# Data Structure for Subjects and Weights
+subjects_data = [
+    {
+        "name": "OHS", "cr": 1,
+        "components": [
+            ("Quiz 1", 10), ("Quiz 2", 10), ("Assignment 1", 5), ("Assignment 2", 5),
+            ("Report 1", 10), ("Mid 1", 15), ("Mid 2", 15), ("Finals", 40)
+        ]
+    },
+    {
+        "name": "Islamiat", "cr": 2,
+        "components": [
+            ("Quiz 1", 3.34), ("Quiz 2", 3.33), ("Quiz 3", 3.33), ("Quiz/Viva", 5),
+            ("Class Participation", 5), ("Mid 1", 15), ("Mid 2", 15), ("Finals", 50)
+        ]
+    },
+    {
+        "name": "ICP", "cr": 2,
+        "components": [
+            ("Quiz 1", 3), ("Quiz 2", 3), ("Quiz 3", 3), ("Quiz 4", 3),
+            ("Assignment 1", 4), ("Assignment 2", 4),
+            ("Mid 1", 15), ("Mid 2", 15), ("Finals", 50)
+        ]
+    },
+    {
+        "name": "Applied Physics", "cr": 2,
+        "components": [
+            ("Quiz 1", 2), ("Quiz 2", 2), ("Quiz 3", 2),
+            ("Assignment 1", 3), ("Assignment 2", 3), ("Assignment 3", 3),
+            ("Attendance", 5), ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
+        ]
+    },
+    {
+        "name": "Applied Calculus", "cr": 3,
+        "components": [
+            ("Quiz 1", 2), ("Quiz 2", 2), ("Quiz 3", 2), ("Quiz 4", 2), ("Quiz 5", 1),
+            ("Assignment 1", 3), ("Assignment 2", 4), ("Assignment 3", 4),
+            ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
+        ]
+    },
+    {
+        "name": "English", "cr": 3,
+        "components": [
+            ("Assignment 1", 2), ("Assignment 2", 1), ("Assignment 3", 2),
+            ("Quiz 1", 2), ("Quiz 2", 1), ("Quiz 3", 2),
+            ("Mid 1", 15), ("Mid 2", 15), ("Project", 6), ("Presentation", 4), ("Final", 50)
+        ]
+    },
+    {
+        "name": "ICT", "cr": 2,
+        "components": [
+            ("Assignment 1", 5), ("Assignment 2", 5), ("Assignment 3", 5),
+            ("Quiz 1", 2.5), ("Quiz 2", 2.5),
+            ("Mid 1", 15), ("Mid 2", 15), ("Final", 50)
+        ]
+    },
+    {
+        "name": "AP Lab", "cr": 1,
+        "components": [
+            ("Quiz 1", 2.5), ("Quiz 2", 2.5), ("Lab work", 52), ("Project", 8), ("Final", 35)
+        ]
+    },
+    {
+        "name": "ICT Lab", "cr": 1,
+        "components": [
+            ("Lab work", 36), ("Quiz", 6), ("Project", 8), ("Final", 50)
+        ]
+    }
+]
+
+
+def input_key(subject_name, component_name):
+    """Widget key of a component's marks box; also its column name in gradebooks."""
+    return f"{subject_name}_{component_name}"
+
+
+def component_columns(subjects=subjects_data):
+    """Gradebook column names for every component, in calculator order."""
+    return [input_key(sub["name"], comp) for sub in subjects for comp, _ in sub["components"]]
+
+
+def gradebook_template_csv(subjects=subjects_data):
+    """Header-only gradebook CSV: a Student column and every component column."""
+    return (",".join(["Student"] + component_columns(subjects)) + "\n").encode("utf-8")
+
+
+# One subject's projection for a given tuple of component entries.
+# ``percentage`` is None when no component has marks yet (graded 0.0).
+SubjectResult = namedtuple("SubjectResult", ["entries", "percentage", "grade_point"])
+
+
+def grade_subject(sub, entries):
+    """Project one subject from its component entries, in component order."""
+    weighted_sum_obtained = 0
+    total_weight_attempted = 0
+    for (_, comp_weight), entry in zip(sub["components"], entries):
+        ratio = get_score_percentage(entry)
+        if ratio is not None:
+            weighted_sum_obtained += (ratio * comp_weight)
+            total_weight_attempted += comp_weight
+    if total_weight_attempted == 0:
+        return SubjectResult(entries, None, 0.0)
+    final_percentage = (weighted_sum_obtained / total_weight_attempted) * 100
+    return SubjectResult(entries, final_percentage, pct_to_gp(final_percentage))
+
+
+def update_results(results, entries_by_subject, subjects=subjects_data):
+    """Regrade only the subjects whose entries changed.
+
+    ``results`` maps subject name to its last ``SubjectResult`` and is
+    updated in place; returns the names of the subjects recomputed.
+    """
+    recomputed = []
+    for sub in subjects:
+        entries = entries_by_subject[sub["name"]]
+        cached = results.get(sub["name"])
+        if cached is None or cached.entries != entries:
+            results[sub["name"]] = grade_subject(sub, entries)
+            recomputed.append(sub["name"])
+    return recomputed
+
+
+def cgpa(results, subjects=subjects_data):
+    """Credit-weighted GPA from per-subject results, or None without credits."""
+    total_credits = 0
+    total_weighted_points = 0
+    for sub in subjects:
+        total_credits += sub["cr"]
+        total_weighted_points += (sub["cr"] * results[sub["name"]].grade_point)
+    if total_credits == 0:
+        return None
+    return total_weighted_points / total_credits
@@ -0,0 +1,186 @@
+"""Vectorized GPA engine for whole-class gradebooks.
+
+A gradebook has one row per student and one column per component, named
+like the calculator's input boxes (``"<Subject>_<Component>"``, see
+``gpa.input_key``), holding "obtained/total" marks. A bare number, or a
+numeric column, is read as the percentage scored in that component (NaN
+when not attempted). Read CSVs with ``dtype=str`` so every cell goes
+through the same parser whatever pandas would have inferred for its column.
+Any other columns (roll number, name, ...) are carried through to the
+result untouched.
+
+The result matches the interactive calculator exactly: per-subject sums are
+accumulated in component order (``cumsum``), the same float operations the
+form loop performs, so a projection that lands exactly on a grade threshold
+is graded identically in both.
+"""
+
+import numpy as np
+import pandas as pd
+
+from gpa import GRADE_STEPS, component_columns, get_score_percentage, input_key, subjects_data
+
+# Ascending thresholds and the grade point for each bucket between them:
+# GRADE_POINTS[searchsorted(GRADE_THRESHOLDS, pct, side="right")]
+GRADE_THRESHOLDS = np.array([t for t, _ in reversed(GRADE_STEPS)], dtype=float)
+GRADE_POINTS = np.array([0.0] + [gp for _, gp in reversed(GRADE_STEPS)])
+
+
+def component_weights(subjects=subjects_data):
+    """Every component's weight, in ``component_columns`` order."""
+    return np.array([weight for sub in subjects for _, weight in sub["components"]], dtype=float)
+
+
+def parse_cell(text):
+    """Ratio for one cell: "x/y" as in the calculator, a bare number as a percentage."""
+    ratio = get_score_percentage(text)
+    if ratio is None and text and "/" not in text:
+        try:
+            return float(text) / 100
+        except ValueError:
+            return None
+    return ratio
+
+
+def parse_marks(values):
+    """Map a column of marks to ratios, NaN where not attempted.
+
+    Gradebooks repeat the same few entries ("8/10", "") thousands of times,
+    so each distinct string is parsed once with the calculator's own parser.
+    """
+    values = pd.Series(values, copy=False)
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return np.full(len(values), np.nan)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        # Numeric columns hold percentages; an all-blank CSV column also lands here
+        return values.to_numpy(dtype=float) / 100
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = [parse_cell(str(v).strip()) for v in uniques]
+    # The extra trailing slot catches the -1 code factorize gives to NaN
+    lookup = np.array([np.nan if p is None else p for p in parsed] + [np.nan])
+    return lookup[codes]
+
+
+def score_ratios(gradebook, subjects=subjects_data):
+    """Return the (students x components) ratio matrix, NaN for unattempted components."""
+    columns = component_columns(subjects)
+    ratios = np.full((len(gradebook), len(columns)), np.nan)
+    for j, column in enumerate(columns):
+        if column in gradebook.columns:
+            ratios[:, j] = parse_marks(gradebook[column])
+    return ratios
+
+
+def project_ratios(ratios, subjects=subjects_data):
+    """Project every student's grades from a ratio matrix.
+
+    Returns (percentages, grade_points, cgpa): two (students x subjects)
+    arrays and one per-student array. Subjects with nothing attempted are
+    0% / 0.0 GP, as in the calculator.
+    """
+    weights = component_weights(subjects)
+    attempted = ~np.isnan(ratios)
+    # Per-component contributions; unattempted components add exactly 0.0
+    obtained_parts = np.where(attempted, ratios, 0.0) * weights
+    attempted_parts = attempted * weights
+
+    n_students = ratios.shape[0]
+    percentages = np.zeros((n_students, len(subjects)))
+    row = 0
+    for j, sub in enumerate(subjects):
+        block = slice(row, row + len(sub["components"]))
+        row = block.stop
+        obtained = np.cumsum(obtained_parts[:, block], axis=1)[:, -1]
+        attempted_weight = np.cumsum(attempted_parts[:, block], axis=1)[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentages[:, j] = np.where(attempted_weight > 0, (obtained / attempted_weight) * 100, 0.0)
+
+    grade_points = GRADE_POINTS[np.searchsorted(GRADE_THRESHOLDS, percentages, side="right")]
+
+    credits = np.array([sub["cr"] for sub in subjects], dtype=float)
+    weighted_points = np.cumsum(grade_points * credits, axis=1)[:, -1]
+    cgpa = weighted_points / credits.sum()
+    return percentages, grade_points, cgpa
+
+
+def batch_gpa(gradebook, subjects=subjects_data):
+    """Grade a whole gradebook; returns one result row per student.
+
+    The result keeps the gradebook's non-component columns and adds
+    ``"<Subject> %"`` and ``"<Subject> GP"`` for every subject plus ``CGPA``.
+    """
+    columns = set(component_columns(subjects))
+    result = gradebook[[c for c in gradebook.columns if c not in columns]].reset_index(drop=True)
+
+    percentages, grade_points, cgpa = project_ratios(score_ratios(gradebook, subjects), subjects)
+    graded = {}
+    for j, sub in enumerate(subjects):
+        graded[f"{sub['name']} %"] = percentages[:, j]
+        graded[f"{sub['name']} GP"] = grade_points[:, j]
+    graded["CGPA"] = cgpa
+    return pd.concat([result, pd.DataFrame(graded)], axis=1)
+
+
+def entry(value):
+    """A gradebook cell as the calculator's box would hold it."""
+    if pd.isna(value):
+        return ""
+    text = str(value).strip()
+    ratio = parse_cell(text)
+    if ratio is not None and "/" not in text:
+        # A bare number: the percentage, as the numeric columns give it
+        return "" if np.isnan(ratio) else f"{float(text)}/100"
+    return text
+
+
+def gradebook_entries(gradebook, subjects=subjects_data):
+    """Yield each student's {subject: entries tuple}, as the calculator's boxes would hold them.
+
+    Numeric (percentage) cells and bare numbers become "x/100"; missing
+    columns and blank or boolean cells become "".
+    """
+    columns = {}
+    for column in component_columns(subjects):
+        values = gradebook[column] if column in gradebook.columns else pd.Series([""] * len(gradebook))
+        if pd.api.types.is_bool_dtype(values.dtype):
+            columns[column] = [""] * len(gradebook)
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            columns[column] = ["" if np.isnan(v) else f"{v}/100" for v in values.to_numpy(dtype=float)]
+        else:
+            columns[column] = [entry(v) for v in values]
+    for i in range(len(gradebook)):
+        yield {
+            sub["name"]: tuple(columns[input_key(sub["name"], comp)][i] for comp, _ in sub["components"])
+            for sub in subjects
+        }
+
+
+def target_plans(gradebook, target, subjects=subjects_data):
+    """Solve ``gpa_target`` for every student; one row per student.
+
+    Adds ``"<Subject> target GP"`` and ``"<Subject> needed %"`` (the score
+    needed in each remaining component, blank when nothing more is needed)
+    for every subject, plus ``Reachable`` and ``Planned CGPA``.
+    """
+    from gpa_target import solve
+
+    columns = set(component_columns(subjects))
+    result = gradebook[[c for c in gradebook.columns if c not in columns]].reset_index(drop=True)
+
+    planned = {key: [] for sub in subjects for key in (f"{sub['name']} target GP", f"{sub['name']} needed %")}
+    planned["Reachable"] = []
+    planned["Planned CGPA"] = []
+    for entries in gradebook_entries(gradebook, subjects):
+        plan = solve(entries, target, subjects)
+        for sub in subjects:
+            subject_plan = plan.subjects[sub["name"]]
+            planned[f"{sub['name']} target GP"].append(subject_plan.grade_point)
+            planned[f"{sub['name']} needed %"].append(subject_plan.needed_percentage)
+        planned["Reachable"].append(plan.reachable)
+        planned["Planned CGPA"].append(plan.cgpa)
+    return pd.concat([result, pd.DataFrame(planned)], axis=1)
+
+
+def results_csv(results):
+    """CSV bytes for download, rounded the way the calculator displays them."""
+    return results.to_csv(index=False, float_format="%.2f").encode("utf-8")
@@ -0,0 +1,158 @@
+"""Headless batch grading of large marks files.
+
+    python gpa_ingest.py marks.csv results.csv [--chunksize 50000] [--workers N]
+
+Reads a gradebook (CSV or Parquet, same columns as the calculator's batch
+upload) in bounded chunks, grades the chunks on a process pool with
+``gpa_batch.batch_gpa`` and appends each result to the output as soon as
+it is ready, in input order. At most ``2 * workers`` chunks are in flight,
+so peak memory depends on the chunk size, not the file size.
+
+For CSV the parent process only splits the input into blocks of raw lines;
+parsing, grading and formatting the output all happen in the workers, so
+throughput scales with the number of cores. (CSV inputs must not contain
+quoted line breaks, which gradebooks don't.)
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import pandas as pd
+
+from gpa_batch import batch_gpa
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the marks file in chunks of at most ``chunksize`` rows.
+
+    Parquet chunks are DataFrames; CSV chunks are raw bytes (header line
+    plus rows) left for the worker to parse.
+    """
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        with open(path, "rb") as f:
+            header = f.readline()
+            while True:
+                lines = list(islice(f, chunksize))
+                if not lines:
+                    break
+                yield header + b"".join(lines)
+
+
+def grade_chunk(chunk, to_csv):
+    """Grade one chunk; returns CSV bytes (with header) or a DataFrame."""
+    if isinstance(chunk, bytes):
+        # As strings: inferring dtypes per chunk would make a column of
+        # marks grade differently depending on where the chunks split
+        chunk = pd.read_csv(io.BytesIO(chunk), dtype=str)
+    results = batch_gpa(chunk)
+    if to_csv:
+        # Two decimals, as the calculator displays them
+        return results.round(2).to_csv(index=False).encode("utf-8")
+    return results
+
+
+class ResultWriter:
+    """Appends graded chunks to a CSV or Parquet file as they arrive."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+
+    def write(self, graded):
+        if isinstance(graded, bytes):
+            # Every chunk carries its own header line; keep only the first
+            header_end = graded.index(b"\n") + 1
+            if self._file is None:
+                self._file = open(self.path, "wb")
+                self._file.write(graded[:header_end])
+            self._file.write(graded[header_end:])
+            self.rows += graded.count(b"\n", header_end)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(graded, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+            self.rows += len(graded)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def ingest(src, dest, chunksize=DEFAULT_CHUNKSIZE, workers=None, progress=None):
+    """Grade ``src`` into ``dest``; returns (rows, seconds).
+
+    ``workers`` defaults to the CPU count; 1 grades inline without a pool.
+    ``progress(rows_done, seconds)`` is called after every written chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    to_csv = not is_parquet(dest)
+    writer = ResultWriter(dest)
+    started = time.perf_counter()
+
+    def done(graded):
+        writer.write(graded)
+        if progress is not None:
+            progress(writer.rows, time.perf_counter() - started)
+
+    try:
+        if workers == 1:
+            for chunk in read_chunks(src, chunksize):
+                done(grade_chunk(chunk, to_csv))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in read_chunks(src, chunksize):
+                    pending.append(pool.submit(grade_chunk, chunk, to_csv))
+                    # Backpressure: don't read further ahead than the pool can use
+                    while len(pending) >= 2 * workers:
+                        done(pending.popleft().result())
+                while pending:
+                    done(pending.popleft().result())
+    finally:
+        writer.close()
+
+    return writer.rows, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a whole-class marks file.")
+    parser.add_argument("src", help="marks file (.csv or .parquet)")
+    parser.add_argument("dest", help="results file (.csv or .parquet)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    def progress(rows, seconds):
+        print(f"\r{rows:,} rows  {rows / max(seconds, 1e-9):,.0f} rows/s", end="", file=sys.stderr)
+
+    rows, seconds = ingest(args.src, args.dest, args.chunksize, args.workers, progress)
+    print(f"\nGraded {rows:,} students in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+""""What do I need?": the least marks that reach a target CGPA.
+
+The marks entered so far fix how much of each course is already earned;
+the components still blank can score anything from 0 to 100%. Every grade
+step (``GRADE_STEPS``) a subject can still finish on is an option, costing
+the share of the course still to be earned to reach it. Options are
+combined with a dynamic program over credit-weighted grade points in
+hundredths (Sum cr x gp >= target x Sum cr): only the cheapest combination
+per points total is kept, totals are capped at the target, and totals that
+can no longer reach it are dropped. Cost is weighted by credits, so the
+plan asks for more where a grade step is cheapest.
+
+A subject's remaining components are planned alike: "at least X% in each".
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+from gpa import GRADE_STEPS, get_score_percentage, grade_subject, subjects_data
+
+# One subject's part of a plan: the grade point aimed for, the score needed
+# in each remaining component (None when nothing more is needed or nothing
+# is left) and the names of those components
+SubjectPlan = namedtuple("SubjectPlan", ["grade_point", "needed_percentage", "remaining"])
+
+# ``cgpa`` is the CGPA the plan earns. When the target is out of reach
+# ``reachable`` is False and the plan is the best possible one.
+TargetPlan = namedtuple("TargetPlan", ["target", "reachable", "cgpa", "subjects"])
+
+
+def _fill(entries, remaining, percentage):
+    """``entries`` with the ``remaining`` positions scored ``percentage``%."""
+    entries = list(entries)
+    for i in remaining:
+        entries[i] = f"{percentage}/100"
+    return tuple(entries)
+
+
+@lru_cache(maxsize=16384)
+def _options(components, entries):
+    sub = {"components": components}
+    remaining = [i for i, entry in enumerate(entries) if get_score_percentage(entry) is None]
+    floor = grade_subject(sub, _fill(entries, remaining, 0)).grade_point
+    options = [(floor, None, 0.0)]
+    if not remaining:
+        return options
+
+    total_weight = sum(weight for _, weight in components)
+    remaining_weight = sum(components[i][1] for i in remaining)
+    earned = grade_subject(sub, _fill(entries, remaining, 0)).percentage * total_weight / 100
+    for threshold, grade_point in reversed(GRADE_STEPS):
+        if grade_point <= floor:
+            continue
+        # Estimate from the weights, rounded up to 0.01%, then confirmed
+        # (and nudged if float rounding disagrees) by the calculator itself
+        guess = (threshold * total_weight / 100 - earned) / remaining_weight * 100
+        percentage = max(math.ceil(round(guess * 100, 6)) / 100, 0.0)
+        while percentage <= 100 and grade_subject(sub, _fill(entries, remaining, percentage)).grade_point < grade_point:
+            percentage = round(percentage + 0.01, 2)
+        if percentage > 100:
+            break
+        options.append((grade_point, percentage, percentage / 100 * remaining_weight / total_weight))
+    return options
+
+
+def subject_options(sub, entries):
+    """Return [(grade_point, needed_percentage, cost)] for one subject.
+
+    The first option is the grade already secured (0% in everything left);
+    each further one is the next grade step still reachable, with the score
+    needed in every remaining component and its cost as a share of the
+    course. Results are cached on the subject's components and entries.
+    """
+    return _options(tuple(sub["components"]), tuple(entries))
+
+
+def solve(entries_by_subject, target, subjects=subjects_data):
+    """Plan the least marks that bring the CGPA to ``target``; returns a ``TargetPlan``."""
+    options = [subject_options(sub, entries_by_subject[sub["name"]]) for sub in subjects]
+    credits = [sub["cr"] for sub in subjects]
+    points = [[round(gp * 100) * cr for gp, _, _ in opts] for opts, cr in zip(options, credits)]
+    need = round(target * 100) * sum(credits)
+
+    # best_after[k]: most points subjects k.. can still add
+    best_after = [0] * (len(subjects) + 1)
+    for k in range(len(subjects) - 1, -1, -1):
+        best_after[k] = best_after[k + 1] + max(points[k])
+
+    reachable = best_after[0] >= need
+    if not reachable:
+        # Aim for the best possible instead
+        need = best_after[0]
+
+    # points total -> (cost, choices as a (previous, option) chain)
+    states = {0: (0.0, None)}
+    for k, (opts, pts) in enumerate(zip(options, points)):
+        following = best_after[k + 1]
+        next_states = {}
+        for total, (cost, chain) in states.items():
+            for j, (option, add) in enumerate(zip(opts, pts)):
+                reached = min(total + add, need)
+                if reached + following < need:
+                    continue
+                candidate = cost + credits[k] * option[2]
+                best = next_states.get(reached)
+                if best is None or candidate < best[0]:
+                    next_states[reached] = (candidate, (chain, j))
+        # A total is only worth keeping if it is cheaper than every higher one
+        states = {}
+        cheapest = math.inf
+        for total in sorted(next_states, reverse=True):
+            if next_states[total][0] < cheapest:
+                cheapest = next_states[total][0]
+                states[total] = next_states[total]
+
+    _, chain = states[need]
+    chosen = []
+    while chain is not None:
+        chain, j = chain
+        chosen.append(j)
+    chosen.reverse()
+
+    plans = {}
+    weighted = 0
+    for sub, opts, j in zip(subjects, options, chosen):
+        grade_point, percentage, _ = opts[j]
+        entries = entries_by_subject[sub["name"]]
+        remaining = [comp for (comp, _), entry in zip(sub["components"], entries) if get_score_percentage(entry) is None]
+        plans[sub["name"]] = SubjectPlan(grade_point, percentage, remaining)
+        weighted += sub["cr"] * grade_point
+    return TargetPlan(target, reachable, weighted / sum(credits), plans)
@@ -0,0 +1,247 @@
+"""Notices and assignments, kept in an embedded SQLite database.
+
+    python notices.py add BSCE-1A notice "Classes on Monday are online" [--expires 2025-09-09]
+    python notices.py add BSCE-1B assignment "ICT Lab 5" --due 2025-09-15
+    python notices.py list [SECTION] [--all]
+    python notices.py remove ID
+
+Items live in ``$NOTICES_DB`` (default ``notices.db`` beside the app), so
+changing them is a write to the database, not a code deploy. Each item has
+a section, a kind, an HTML body, an optional due time and an expiry time
+(Unix seconds; items that never expire get ``NEVER``). Only active items
+are read, with one range query on the (section, expires) index.
+
+Each section's rendered HTML is cached process-wide until the database file
+changes or the first of its items expires, so a rerun normally costs one
+``stat()``.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schedule_store import file_version
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.environ.get("NOTICES_DB") or os.path.join(APP_DIR, "notices.db")
+TIMEZONE = ZoneInfo("Asia/Karachi")
+
+KINDS = ("notice", "assignment")
+# 9999-12-31 23:59:59 UTC: "never expires", kept as a number so the
+# active-items query stays a plain index range
+NEVER = 253402300799
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    section TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('notice', 'assignment')),
+    body TEXT NOT NULL,
+    due INTEGER,
+    expires INTEGER NOT NULL DEFAULT 253402300799
+);
+CREATE INDEX IF NOT EXISTS items_section_expires ON items (section, expires);
+CREATE INDEX IF NOT EXISTS items_section_due ON items (section, due);
+"""
+
+# What the app showed before the items moved to the database; written
+# once, when the database is created
+SEED = [
+    ("BSCE-1A", "notice", "Report any bugs/issues or change of schedule to me on Whatsapp", None),
+    ("BSCE-1A", "notice", "<b>All classes scheduled for 8th and 9th Sept will be conducted online due to adverse weather</b>", None),
+    ("BSCE-1B", "notice", "Report any bugs or issues to me on whatsapp", None),
+    ("BSCE-1B", "assignment", "ICT Lab:Complete Lab 5 : Intro to Viso and Flutter flow (Submission on Monday)", None),
+]
+
+Item = namedtuple("Item", ["id", "section", "kind", "body", "due", "expires"])
+
+
+def is_date(text):
+    """True for a bare date ("2025-09-15"), False for a date-time."""
+    return "T" not in text and " " not in text
+
+
+def parse_time(text, end_of_day=False):
+    """Unix seconds for an ISO date or date-time, in the app's timezone if none is given.
+
+    A bare date means its start, or with ``end_of_day`` the start of the next day.
+    """
+    if is_date(text):
+        day = date.fromisoformat(text) + timedelta(days=1 if end_of_day else 0)
+        moment = datetime(day.year, day.month, day.day, tzinfo=TIMEZONE)
+    else:
+        moment = datetime.fromisoformat(text)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=TIMEZONE)
+    return int(moment.timestamp())
+
+
+def format_due(due):
+    return datetime.fromtimestamp(due, TIMEZONE).strftime("%a %d %b, %H:%M").replace(", 00:00", "")
+
+
+def render(section, items):
+    """The notices box and assignments box for ``section``; a box is left out when it is empty."""
+    notices = [item for item in items if item.kind == "notice"]
+    assignments = [item for item in items if item.kind == "assignment"]
+    parts = []
+    if notices:
+        parts.append(
+            f'<div class="notices-box"><h3>📢 Notices for {section}</h3><ul>'
+            + "".join(f"<li>{item.body}</li>" for item in notices)
+            + "</ul></div>"
+        )
+    if assignments:
+        parts.append(
+            f'<div class="assignments-box"><h3>📝 Assignments Due for {section}</h3><ul>'
+            + "".join(
+                f"<li><b>{item.body}</b>{'' if item.due is None else f' (due {format_due(item.due)})'}</li>"
+                for item in assignments
+            )
+            + "</ul></div>"
+        )
+    return "\n".join(parts)
+
+
+class NoticeStore:
+    """Reads and writes items, and caches each section's rendered HTML."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._ready = False
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def connect(self):
+        db = sqlite3.connect(self.path)
+        if not self._ready:
+            with self._lock:
+                created = not db.execute("SELECT 1 FROM sqlite_master WHERE name = 'items'").fetchone()
+                with db:
+                    db.executescript(SCHEMA)
+                    if created:
+                        db.executemany("INSERT INTO items (section, kind, body, due) VALUES (?, ?, ?, ?)", SEED)
+                self._ready = True
+        return db
+
+    def add(self, section, kind, body, due=None, expires=None):
+        """Add an item and return its id. Assignments expire at their due time by default."""
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, not {kind!r}")
+        if expires is None:
+            expires = due if kind == "assignment" and due is not None else NEVER
+        with closing(self.connect()) as db, db:
+            cursor = db.execute(
+                "INSERT INTO items (section, kind, body, due, expires) VALUES (?, ?, ?, ?, ?)",
+                (section, kind, body, due, expires),
+            )
+            return cursor.lastrowid
+
+    def remove(self, item_id):
+        """Delete an item; returns False if there was none with that id."""
+        with closing(self.connect()) as db, db:
+            return db.execute("DELETE FROM items WHERE id = ?", (item_id,)).rowcount > 0
+
+    def items(self, section=None, now=None, active=True):
+        """Items for ``section`` (every section if None), optionally only those not expired at ``now``."""
+        now = int(time.time() if now is None else now)
+        where, args = [], []
+        if section is not None:
+            where.append("section = ?")
+            args.append(section)
+        if active:
+            where.append("expires > ?")
+            args.append(now)
+        query = "SELECT id, section, kind, body, due, expires FROM items"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY section, due IS NULL, due, id"
+        with closing(self.connect()) as db:
+            return [Item(*row) for row in db.execute(query, args)]
+
+    def section_html(self, section, now=None):
+        """Return the cached HTML of ``section``'s active items ("" when there are none)."""
+        now = time.time() if now is None else now
+        if not self._ready:
+            # Creates the file on first use
+            self.connect().close()
+        version = file_version(self.path)
+        cached = self._cache.get(section)
+        if cached is not None and cached[0] == version and now < cached[1]:
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        items = self.items(section, now)
+        html = render(section, items)
+        valid_until = min([item.expires for item in items], default=NEVER)
+        self._cache[section] = (version, valid_until, html)
+        return html
+
+    def stats(self):
+        return {"db": self.path, "cached_sections": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every session served by the process
+store = NoticeStore()
+
+
+def section_html(section):
+    return store.section_html(section)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage section notices and assignments.")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="database file (default: $NOTICES_DB or notices.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a notice or assignment")
+    add.add_argument("section")
+    add.add_argument("kind", choices=KINDS)
+    add.add_argument("body", help="text of the item; HTML such as <b> is allowed")
+    add.add_argument("--due", help="due date or date-time (YYYY-MM-DD[THH:MM]), Asia/Karachi unless an offset is given; "
+                                   "an assignment is shown until then (to the end of the day for a bare date)")
+    add.add_argument("--expires", help="stop showing it at this date or date-time (a bare date means the end of that day)")
+
+    listing = commands.add_parser("list", help="list items")
+    listing.add_argument("section", nargs="?")
+    listing.add_argument("--all", action="store_true", help="include expired items")
+
+    remove = commands.add_parser("remove", help="delete an item")
+    remove.add_argument("id", type=int)
+
+    args = parser.parse_args(argv)
+    notices = NoticeStore(args.db)
+    if args.command == "add":
+        expires = parse_time(args.expires, end_of_day=True) if args.expires else None
+        if expires is None and args.kind == "assignment" and args.due and is_date(args.due):
+            # Due on a day, not at a time: keep it up until that day is over
+            expires = parse_time(args.due, end_of_day=True)
+        item_id = notices.add(
+            args.section,
+            args.kind,
+            args.body,
+            due=parse_time(args.due) if args.due else None,
+            expires=expires,
+        )
+        print(f"Added item {item_id}", file=sys.stderr)
+    elif args.command == "list":
+        for item in notices.items(args.section, active=not args.all):
+            due = "" if item.due is None else f"  due {format_due(item.due)}"
+            expires = "" if item.expires == NEVER else f"  expires {format_due(item.expires)}"
+            print(f"{item.id:>5}  {item.section}  {item.kind:<10}  {item.body}{due}{expires}")
+    elif not notices.remove(args.id):
+        sys.exit(f"No item {args.id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Opt-in per-rerun stage profiler.
+
+Enable with ``CLASS_SCHEDULE_PROFILE=1`` in the environment or ``?profile=1``
+in the page URL. ``app.py`` marks where each stage begins with ``stage()``;
+a stage runs until the next one starts. ``markdown()`` is a drop-in for
+``st.markdown`` that also counts the deltas each stage emits. At the end of
+the run ``finish()`` shows the totals in a collapsible debug panel and logs
+one JSON line to the ``class_schedule.profile`` logger, for p50/p95
+aggregation across sessions.
+
+When profiling is off every call here is a cheap no-op.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+logger = logging.getLogger("class_schedule.profile")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Each session's script runs on its own thread, so the active run is per-thread
+_local = threading.local()
+
+
+class RerunProfile:
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.stages = {}
+        self._stage = None
+        self._stage_started = None
+
+    def stage(self, name):
+        now = time.perf_counter()
+        self._close(now)
+        self.stages.setdefault(name, {"ms": 0.0, "deltas": 0})
+        self._stage = name
+        self._stage_started = now
+
+    def count(self):
+        if self._stage is not None:
+            self.stages[self._stage]["deltas"] += 1
+
+    def _close(self, now):
+        if self._stage is not None:
+            self.stages[self._stage]["ms"] += (now - self._stage_started) * 1e3
+            self._stage = None
+
+    def summary(self):
+        now = time.perf_counter()
+        self._close(now)
+        return {
+            "ts": time.time(),
+            "label": self.label,
+            "total_ms": round((now - self.started) * 1e3, 3),
+            "deltas": sum(s["deltas"] for s in self.stages.values()),
+            "stages": {name: {"ms": round(s["ms"], 3), "deltas": s["deltas"]} for name, s in self.stages.items()},
+        }
+
+
+def enabled():
+    if os.environ.get("CLASS_SCHEDULE_PROFILE", "") not in ("", "0"):
+        return True
+    return st.query_params.get("profile", "0") not in ("", "0")
+
+
+def begin(label=""):
+    """Start profiling this rerun if profiling is enabled."""
+    _local.profile = RerunProfile(label) if enabled() else None
+
+
+def active():
+    return getattr(_local, "profile", None)
+
+
+def stage(name):
+    """Mark the start of stage ``name``; the previous stage ends here."""
+    profile = active()
+    if profile is not None:
+        profile.stage(name)
+
+
+def markdown(body, **kwargs):
+    """``st.markdown`` that counts toward the current stage's deltas."""
+    profile = active()
+    if profile is not None:
+        profile.count()
+    return st.markdown(body, **kwargs)
+
+
+def set_label(label):
+    profile = active()
+    if profile is not None:
+        profile.label = label
+
+
+def finish(extra=None):
+    """End the rerun: log one JSON line and show the debug panel.
+
+    ``extra`` is a dict of additional fields (cache stats, ...) to include.
+    """
+    profile = active()
+    if profile is None:
+        return
+    _local.profile = None
+
+    summary = profile.summary()
+    if extra:
+        summary.update(extra)
+    logger.info(json.dumps(summary, default=str))
+
+    with st.expander("🛠️ Debug: rerun profile"):
+        rows = ["| Stage | ms | st.markdown deltas |", "|---|---:|---:|"]
+        for name, s in summary["stages"].items():
+            rows.append(f"| {name} | {s['ms']:.2f} | {s['deltas']} |")
+        rows.append(f"| **Total** | **{summary['total_ms']:.2f}** | **{summary['deltas']}** |")
+        st.markdown("\n".join(rows))
+        if extra:
+            st.json(extra, expanded=False)
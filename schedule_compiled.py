@@ -0,0 +1,271 @@
+"""Compile every section's schedule into one memory-mapped binary file.
+
+    python schedule_compiled.py schedules.bin [--source sections.csv|DIR]
+
+Each replica normally parses every section CSV for itself. Compiling
+writes them all to one read-only file that every worker maps with
+``mmap``: the schedule columns are used in place (``bisect`` runs straight
+on the mapped pages), so N workers share one page-cache copy instead of N
+parsed copies. Set ``SCHEDULE_COMPILED=schedules.bin`` to serve from it.
+
+To publish new schedules, compile again: the file is written beside the
+old one and swapped in with ``os.replace``, and workers map the new file on
+their next request. Pages of the old file stay valid for sessions still
+using it.
+
+Layout (native byte order, every block 8-byte aligned)::
+
+    header    magic, n_sections, n_rows, n_strings
+    sections  n_sections x (name string id, first row, row count, 0) uint32
+    starts    n_rows int16      minute-of-week, sorted within each section
+    ends      n_rows int16
+    days      n_rows int8
+    codes     5 x n_rows uint32 string ids, one block per text column
+    strings   n_strings + 1 uint32 offsets into the UTF-8 blob, then the blob
+
+Rows are fixed-width, stored column by column so each section's slice of a
+column is a contiguous typed array.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+
+from schedule_store import Schedule
+from schedule_table import POOLS, TEXT_COLUMNS, Rows, ScheduleTable
+
+MAGIC = b"SCHEDv1" + (b"L" if sys.byteorder == "little" else b"B")
+HEADER = struct.Struct("=8sIII")
+SECTION = struct.Struct("=IIII")
+
+
+def _align(offset):
+    return (offset + 7) // 8 * 8
+
+
+def layout(n_sections, n_rows, n_strings):
+    """Byte offsets of every block for the given counts."""
+    offsets = {}
+    position = _align(HEADER.size)
+    for block, size in [
+        ("sections", SECTION.size * n_sections),
+        ("starts", 2 * n_rows),
+        ("ends", 2 * n_rows),
+        ("days", n_rows),
+    ] + [(column, 4 * n_rows) for column in TEXT_COLUMNS] + [
+        ("string_offsets", 4 * (n_strings + 1)),
+    ]:
+        offsets[block] = position
+        position = _align(position + size)
+    offsets["string_data"] = position
+    return offsets
+
+
+def compile_tables(tables, path):
+    """Write {section: ScheduleTable} to ``path``, atomically replacing any old file."""
+    strings = {}
+
+    def string_id(text):
+        return strings.setdefault(text, len(strings))
+
+    sections = array("I")
+    starts, ends, days = array("h"), array("h"), array("b")
+    codes = {column: array("I") for column in TEXT_COLUMNS}
+    for name, table in tables.items():
+        sections.extend([string_id(name), len(starts), len(table), 0])
+        starts.extend(table.starts)
+        ends.extend(table.ends)
+        days.extend(table.days)
+        for column in TEXT_COLUMNS:
+            pool = POOLS[column].values
+            codes[column].extend(string_id(pool[code]) for code in table.codes[column])
+
+    blob = bytearray()
+    string_offsets = array("I", [0])
+    for text in strings:
+        blob += text.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    offsets = layout(len(tables), len(starts), len(strings))
+    blocks = dict(sections=sections, starts=starts, ends=ends, days=days, string_offsets=string_offsets, **codes)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".schedules-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(tables), len(starts), len(strings)))
+            for block, data in blocks.items():
+                f.seek(offsets[block])
+                f.write(data.tobytes())
+            f.seek(offsets["string_data"])
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        # Readers see either the old file or the new one, never a partial write
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CompiledFile:
+    """A mapped compiled file; columns are ``memoryview`` casts of its pages."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.version = (st.st_ino, st.st_mtime_ns, st.st_size)
+            self.size = st.st_size
+            # The mapping stays valid after the file is closed or replaced
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, n_sections, n_rows, n_strings = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled schedule file for this platform; recompile it")
+        offsets = layout(n_sections, n_rows, n_strings)
+
+        def column(block, fmt, count):
+            size = struct.calcsize(fmt) * count
+            return view[offsets[block]:offsets[block] + size].cast(fmt)
+
+        self.starts = column("starts", "h", n_rows)
+        self.ends = column("ends", "h", n_rows)
+        self.days = column("days", "b", n_rows)
+        self.codes = {name: column(name, "I", n_rows) for name in TEXT_COLUMNS}
+        self._string_offsets = column("string_offsets", "I", n_strings + 1)
+        self._string_data = view[offsets["string_data"]:]
+        self._strings = [None] * n_strings
+
+        records = column("sections", "I", 4 * n_sections)
+        self.sections = {}
+        for i in range(n_sections):
+            name_id, first, count, _ = records[4 * i:4 * i + 4]
+            self.sections[self.string(name_id)] = (first, count)
+        self.rows = n_rows
+
+    def string(self, i):
+        # Decoded on first display, then kept
+        text = self._strings[i]
+        if text is None:
+            text = bytes(self._string_data[self._string_offsets[i]:self._string_offsets[i + 1]]).decode("utf-8")
+            self._strings[i] = text
+        return text
+
+    def table(self, name):
+        return MappedTable(self, *self.sections[name])
+
+
+class MappedTable(ScheduleTable):
+    """A ``ScheduleTable`` whose columns are slices of a ``CompiledFile``."""
+
+    def __init__(self, compiled, first, count):
+        rows = slice(first, first + count)
+        self.compiled = compiled
+        self.days = compiled.days[rows]
+        self.starts = compiled.starts[rows]
+        self.ends = compiled.ends[rows]
+        self.codes = {column: compiled.codes[column][rows] for column in TEXT_COLUMNS}
+        self.rows = Rows(self)
+
+    def text(self, column, i):
+        return self.compiled.string(self.codes[column][i])
+
+    def pool_codes(self, column):
+        # Codes here index the file's string table; each distinct one is
+        # looked up once
+        pool = POOLS[column]
+        codes = self.codes[column]
+        translated = {code: pool.code(self.compiled.string(code)) for code in set(codes)}
+        return array("I", map(translated.__getitem__, codes))
+
+    def nbytes(self):
+        # Shared page cache, not this process's heap
+        return 0
+
+
+class CompiledRegistry:
+    """Section registry backed by a compiled file, remapped when the file is replaced.
+
+    Offers the ``SectionRegistry`` methods the app uses.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.loads = 0
+        self._compiled = None
+        self._schedules = {}
+        self._lock = threading.Lock()
+
+    def _current(self):
+        st = os.stat(self.path)
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
+        compiled = self._compiled
+        if compiled is None or compiled.version != version:
+            with self._lock:
+                if self._compiled is None or self._compiled.version != version:
+                    self._compiled = CompiledFile(self.path)
+                    self._schedules = {}
+                    self.loads += 1
+                compiled = self._compiled
+        return compiled
+
+    def sections(self):
+        return self._current().sections
+
+    def names(self):
+        return list(self.sections())
+
+    def get(self, name, cache=True):
+        """Return the ``Schedule`` for section ``name``, shared until the file is replaced."""
+        compiled = self._current()
+        schedules = self._schedules
+        schedule = schedules.get(name)
+        if schedule is None or schedule.version[0] != compiled.version:
+            schedule = Schedule(self.path, (compiled.version, name), compiled.table(name))
+            if cache:
+                schedules[name] = schedule
+        return schedule
+
+    def versions(self):
+        compiled = self._current()
+        return {name: compiled.version for name in compiled.sections}
+
+    def stats(self):
+        compiled = self._current()
+        return {
+            "compiled": self.path,
+            "sections": len(compiled.sections),
+            "rows": compiled.rows,
+            "bytes": compiled.size,
+            "loads": self.loads,
+        }
+
+
+def main(argv=None):
+    from section_registry import DEFAULT_MANIFEST, SectionRegistry
+
+    parser = argparse.ArgumentParser(description="Compile all section schedules into one binary file.")
+    parser.add_argument("dest", help="compiled file to write (replaced atomically)")
+    parser.add_argument("--source", default=os.environ.get("SCHEDULE_DIR") or DEFAULT_MANIFEST,
+                        help="sections manifest CSV or directory of section CSVs")
+    args = parser.parse_args(argv)
+
+    sections = SectionRegistry(args.source).sections()
+    tables = {name: ScheduleTable.from_csv(path) for name, path in sections.items()}
+    for name, table in tables.items():
+        if table.dropped:
+            print(f"{name}: left out {table.dropped} rows with an unknown day or time", file=sys.stderr)
+    compile_tables(tables, args.dest)
+    rows = sum(len(table) for table in tables.values())
+    print(f"Compiled {len(tables)} sections ({rows:,} classes) into {args.dest}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""iCalendar and JSON exports of a section's schedule.
+
+Each class becomes a weekly recurring event (``.ics``) or a compact row
+(``.json``). Both formats are produced by streaming writers that yield the
+document piece by piece; the finished bytes are cached on the parsed
+schedule together with a content-hash ETag, so repeated downloads and
+calendar clients polling the feed are served from memory until the section
+file changes.
+
+Events start in the week of ``$SCHEDULE_TERM_START`` (YYYY-MM-DD, default
+the first Monday of the current year) and repeat weekly until the end of
+``$SCHEDULE_TERM_END`` (YYYY-MM-DD, the last day of classes), or
+indefinitely if it isn't set. Set both for each term so calendars don't
+show classes outside it.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from schedule_index import DAY_ORDER, MINUTES_PER_DAY, get_index
+
+TIMEZONE = "Asia/Karachi"
+
+# ``etag`` is the quoted content hash, ready for the ETag header
+Export = namedtuple("Export", ["body", "etag", "content_type", "filename"])
+
+FORMATS = {
+    "ics": "text/calendar; charset=utf-8",
+    "json": "application/json",
+}
+
+
+def term_start():
+    """Monday of the week the recurring events start in."""
+    text = os.environ.get("SCHEDULE_TERM_START")
+    if text:
+        start = date.fromisoformat(text)
+    else:
+        start = date(date.today().year, 1, 1)
+        start += timedelta(days=-start.weekday() % 7)
+    return start - timedelta(days=start.weekday())
+
+
+def term_end():
+    """Last day of classes, or None when the term has no set end."""
+    text = os.environ.get("SCHEDULE_TERM_END")
+    return date.fromisoformat(text) if text else None
+
+
+def _ics_text(value):
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Fold a content line to 75 octets, as RFC 5545 requires."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data + b"\r\n"
+    parts = []
+    while len(data) > 75:
+        cut = 75 if not parts else 74
+        # Don't split a UTF-8 sequence
+        while cut and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+    parts.append(data)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def iter_ics(section, index, start=None, end=None):
+    """Yield the section's iCalendar feed in chunks of bytes.
+
+    Events repeat until the end of day ``end`` (default ``term_end()``).
+    """
+    start = start or term_start()
+    end = end or term_end()
+    stamp = start.strftime("%Y%m%dT000000Z")
+    rule = "RRULE:FREQ=WEEKLY"
+    if end is not None:
+        # UNTIL is in UTC when DTSTART has a TZID (RFC 5545 3.3.10)
+        until = datetime.combine(end, time(23, 59, 59), ZoneInfo(TIMEZONE)).astimezone(timezone.utc)
+        rule += f";UNTIL={until:%Y%m%dT%H%M%SZ}"
+    yield b"".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//class-schedule//schedule export//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_ics_text(section)}",
+        f"X-WR-TIMEZONE:{TIMEZONE}",
+        "BEGIN:VTIMEZONE",
+        f"TZID:{TIMEZONE}",
+        "BEGIN:STANDARD",
+        "DTSTART:19700101T000000",
+        "TZOFFSETFROM:+0500",
+        "TZOFFSETTO:+0500",
+        "TZNAME:PKT",
+        "END:STANDARD",
+        "END:VTIMEZONE",
+    ])
+    for i, row in enumerate(index.rows):
+        day = index.starts[i] // MINUTES_PER_DAY
+        first = start + timedelta(days=day)
+        begin = index.starts[i] - day * MINUTES_PER_DAY
+        end = index.ends[i] - day * MINUTES_PER_DAY
+        uid = hashlib.sha1(
+            f"{section}|{i}|{index.starts[i]}|{index.ends[i]}|{row['Course']}".encode("utf-8")
+        ).hexdigest()[:16]
+        yield b"".join(_fold(line) for line in [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@class-schedule",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;TZID={TIMEZONE}:{first:%Y%m%d}T{begin // 60:02d}{begin % 60:02d}00",
+            f"DTEND;TZID={TIMEZONE}:{first:%Y%m%d}T{end // 60:02d}{end % 60:02d}00",
+            f"{rule};BYDAY={DAY_ORDER[day][:2].upper()}",
+            f"SUMMARY:{_ics_text(row['Course'])}",
+            f"LOCATION:{_ics_text(row['Venue'])}",
+            f"DESCRIPTION:{_ics_text(row['Teacher'])}",
+            "END:VEVENT",
+        ])
+    yield _fold("END:VCALENDAR")
+
+
+def iter_json(section, index):
+    """Yield the section's JSON document in chunks of bytes.
+
+    ``classes`` rows follow ``columns``; times are minutes after midnight.
+    """
+    yield (
+        '{"section":' + json.dumps(section)
+        + ',"columns":["day","start","end","course","teacher","venue"],"classes":['
+    ).encode("utf-8")
+    for i, row in enumerate(index.rows):
+        day = index.starts[i] // MINUTES_PER_DAY
+        record = [
+            DAY_ORDER[day],
+            index.starts[i] - day * MINUTES_PER_DAY,
+            index.ends[i] - day * MINUTES_PER_DAY,
+            row["Course"],
+            row["Teacher"],
+            row["Venue"],
+        ]
+        yield (("," if i else "") + json.dumps(record, ensure_ascii=False, separators=(",", ":"))).encode("utf-8")
+    yield b"]}"
+
+
+def build_export(section, index, fmt):
+    """Run a streaming writer to completion, hashing as it goes."""
+    writer = iter_ics(section, index) if fmt == "ics" else iter_json(section, index)
+    digest = hashlib.sha256()
+    chunks = []
+    for chunk in writer:
+        digest.update(chunk)
+        chunks.append(chunk)
+    return Export(b"".join(chunks), f'"{digest.hexdigest()[:32]}"', FORMATS[fmt], f"{section}.{fmt}")
+
+
+def get_export(section, schedule, fmt):
+    """Return the cached ``Export`` of ``schedule`` in ``fmt`` ("ics" or "json")."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    return schedule.derive(("export", fmt), lambda s: build_export(section, get_index(s), fmt))
@@ -0,0 +1,212 @@
+"""Precompiled per-section index for the "Happening Now / Next Up" lookup.
+
+Times are minute-of-week integers (Monday 00:00 is 0) in the schedule
+table's columns, sorted by start time, so finding the current and next class is a bisect
+rather than a filter/sort/iterrows over the DataFrame. An index is built
+once per schedule version and shared by every session.
+"""
+
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Only gaps longer than this are shown as breaks between classes
+BREAK_MIN_MINUTES = 15
+
+
+def parse_hhmm(text):
+    """Parse "8:00" / "09:50" into minutes after midnight, or None if invalid."""
+    try:
+        hours, minutes = str(text).strip().split(":")
+        hours, minutes = int(hours), int(minutes)
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def minute_of_week(dt):
+    """Minute-of-week for a datetime (its own wall clock, Monday 00:00 is 0)."""
+    return dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
+# A Monday, so absolute_minute(dt) % MINUTES_PER_WEEK == minute_of_week(dt)
+_EPOCH_MONDAY = datetime(1970, 1, 5)
+
+
+def absolute_minute(dt):
+    """Whole minutes of ``dt``'s wall clock since a fixed Monday midnight."""
+    return (dt.replace(tzinfo=None) - _EPOCH_MONDAY) // timedelta(minutes=1)
+
+
+def format_break(gap_minutes):
+    """Render a gap as "1 hr 5 min" / "45 min" the way the day tabs always have."""
+    hours, minutes = divmod(int(gap_minutes), 60)
+    text = ""
+    if hours > 0:
+        text += f"{hours} hr "
+    if minutes > 0:
+        text += f"{minutes} min"
+    return text.strip()
+
+
+class ScheduleIndex:
+    """Sorted minute-of-week view of one schedule version.
+
+    Built over a ``schedule_table.ScheduleTable``, whose rows are already in
+    week order: ``rows[i]`` is the display record for the i-th class and
+    ``starts``/``ends`` its minute-of-week bounds. Classes occupy the
+    half-open interval [start, end), so back-to-back classes hand over
+    cleanly at the boundary minute.
+    """
+
+    def __init__(self, table, version=None):
+        self.version = version
+        self.starts = table.starts
+        self.ends = table.ends
+        self.rows = table.rows
+
+        # max_end[i] is the latest end among classes 0..i. Walking back from the
+        # bisect point can stop as soon as it drops to <= now, which keeps the
+        # overlap search O(log n + k) for k overlapping classes.
+        self.max_end = array("h")
+        latest = -1
+        for end in self.ends:
+            latest = max(latest, end)
+            self.max_end.append(latest)
+
+        # Per-day slices of the sorted lists and the gap before each class
+        self.day_bounds = {}
+        self.gaps = array("h", bytes(2 * len(self.starts)))
+        for i, day in enumerate(table.days):
+            lo, _ = self.day_bounds.get(day, (i, i))
+            self.day_bounds[day] = (lo, i + 1)
+            if i > lo:
+                self.gaps[i] = self.starts[i] - self.ends[i - 1]
+
+        self.days = [DAY_ORDER[d] for d in sorted(self.day_bounds)]
+
+        # Every minute at which the now/next answer can change
+        midnights = range(0, MINUTES_PER_WEEK, MINUTES_PER_DAY)
+        self.boundaries = array("h", sorted(set(self.starts) | set(self.ends) | set(midnights)))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def day_range(self, day):
+        """Return the (lo, hi) slice of classes on ``day`` (a day name)."""
+        return self.day_bounds.get(DAY_ORDER.index(day), (0, 0))
+
+    def breaks(self, day):
+        """Yield (row_index, gap_minutes) for breaks long enough to display on ``day``."""
+        lo, hi = self.day_range(day)
+        for i in range(lo + 1, hi):
+            if self.gaps[i] > BREAK_MIN_MINUTES:
+                yield i, self.gaps[i]
+
+    def now_next(self, now_minute):
+        """Return (current_rows, next_row, next_start) at ``now_minute``.
+
+        ``current_rows`` lists every class in progress (there can be several
+        when classes overlap). ``next_row`` is the first class starting after
+        now, wrapping around to the start of the week, so on Saturday night it
+        is Monday's first class; ``next_start`` is its minute-of-week, plus
+        ``MINUTES_PER_WEEK`` when it wrapped. Both are None only for an empty
+        schedule.
+        """
+        n = len(self.starts)
+        if n == 0:
+            return [], None, None
+
+        pos = bisect_right(self.starts, now_minute)
+
+        current = []
+        i = pos - 1
+        while i >= 0 and self.max_end[i] > now_minute:
+            if self.ends[i] > now_minute:
+                current.append(self.rows[i])
+            i -= 1
+        current.reverse()
+
+        if pos < n:
+            return current, self.rows[pos], self.starts[pos]
+        return current, self.rows[0], self.starts[0] + MINUTES_PER_WEEK
+
+    def next_boundary(self, now_minute):
+        """First minute after ``now_minute`` at which ``now_next`` can change.
+
+        That is the next class start or end, or midnight (when "today"
+        changes), wrapping into next week like ``now_next``.
+        """
+        pos = bisect_right(self.boundaries, now_minute)
+        if pos < len(self.boundaries):
+            return self.boundaries[pos]
+        return self.boundaries[0] + MINUTES_PER_WEEK
+
+
+class NowNextSnapshot:
+    """The now/next answer for one schedule, shared by every session.
+
+    The answer only changes at a class boundary, so it is computed once and
+    served as-is until the next boundary passes. ``computed`` counts real
+    lookups and ``saved`` the requests answered from the snapshot.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.computed = 0
+        self.saved = 0
+        # (valid_from, valid_until, answer), swapped as one tuple so readers
+        # never pair an answer with another answer's validity window
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _cached(self, minute):
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] <= minute < snapshot[1]:
+            self.saved += 1
+            return snapshot[2]
+        return None
+
+    def get(self, now):
+        """Return ``index.now_next`` for the wall-clock time of datetime ``now``."""
+        minute = absolute_minute(now)
+        value = self._cached(minute)
+        if value is not None:
+            return value
+        with self._lock:
+            value = self._cached(minute)
+            if value is not None:
+                return value
+            week_minute = minute % MINUTES_PER_WEEK
+            value = self.index.now_next(week_minute)
+            valid_until = minute + self.index.next_boundary(week_minute) - week_minute
+            self._snapshot = (minute, valid_until, value)
+            self.computed += 1
+            return value
+
+    def seconds_until_change(self, now):
+        """Seconds from ``now`` until the snapshot's answer next changes."""
+        minute = absolute_minute(now)
+        week_minute = minute % MINUTES_PER_WEEK
+        boundary = self.index.next_boundary(week_minute) - week_minute
+        return boundary * 60 - now.second - now.microsecond / 1e6
+
+    def stats(self):
+        return {"computed": self.computed, "saved": self.saved}
+
+
+def get_index(schedule):
+    """Return the shared ``ScheduleIndex`` for a ``schedule_store.Schedule``."""
+    return schedule.derive("index", lambda s: ScheduleIndex(s.table, s.version))
+
+
+def get_snapshot(schedule):
+    """Return the shared ``NowNextSnapshot`` for a ``schedule_store.Schedule``."""
+    return schedule.derive("now_next", lambda s: NowNextSnapshot(get_index(s)))
@@ -0,0 +1,41 @@
+"""Cached HTML for the per-day schedule view.
+
+A day's class cards and break boxes are built as a single HTML block, so
+showing a day costs one ``st.markdown`` delta instead of one per card. Blocks
+are cached on the parsed schedule, so they are rebuilt only when the
+section's file changes (and dropped when the section is evicted).
+"""
+
+from schedule_index import format_break, get_index
+
+
+def class_card(row):
+    return (
+        '<div class="class-box">'
+        f"<b>📘 {row['Course']}</b><br>"
+        f"⏰ {row['Start_Time']} - {row['End_Time']}<br>"
+        f"👨‍🏫 {row['Teacher']}<br>"
+        f"📍 {row['Venue']}"
+        "</div>"
+    )
+
+
+def break_box(gap_minutes):
+    return f'<div class="break-box">☕ Break ({format_break(gap_minutes)})</div>'
+
+
+def build_day_html(index, day):
+    """Render every class and break on ``day`` as one HTML string."""
+    lo, hi = index.day_range(day)
+    breaks = dict(index.breaks(day))
+    parts = []
+    for i in range(lo, hi):
+        if i in breaks:
+            parts.append(break_box(breaks[i]))
+        parts.append(class_card(index.rows[i]))
+    return "\n".join(parts)
+
+
+def day_html(schedule, day):
+    """Return the cached HTML block for ``schedule`` on ``day``."""
+    return schedule.derive(("day_html", day), lambda s: build_day_html(get_index(s), day))
@@ -0,0 +1,158 @@
+"""Process-wide cache of parsed schedule CSVs.
+
+Streamlit re-executes ``app.py`` on every widget interaction, for every
+session. Parsing the section files each time is wasted work: they change a
+few times a semester. The store parses each file once and hands the same
+parsed object to every session until the file's mtime or size changes.
+Parsed files are kept as compact ``ScheduleTable`` columns, not DataFrames.
+
+The cache is a bounded LRU, so serving hundreds of sections keeps memory
+flat: sections nobody has looked at recently are dropped and re-parsed on
+their next request. A ``schedule_watch`` thread can swap an edited file in
+ahead of the next request.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from schedule_table import ScheduleTable
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("SCHEDULE_CACHE_SIZE", "64"))
+
+
+class Schedule:
+    """A parsed schedule file.
+
+    ``version`` is the (mtime_ns, size) pair the table was parsed from.
+    Objects derived from the table (the day index, rendered HTML) live in
+    ``derived`` so they are dropped together with the schedule on eviction.
+    """
+
+    def __init__(self, path, version, table):
+        self.path = path
+        self.version = version
+        self.table = table
+        self.derived = {}
+        # Reentrant: a builder may derive what it depends on (the day index)
+        self._lock = threading.RLock()
+
+    def derive(self, key, build):
+        """Return ``derived[key]``, computing it with ``build(self)`` on first use."""
+        value = self.derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self.derived.get(key)
+                if value is None:
+                    value = build(self)
+                    self.derived[key] = value
+        return value
+
+
+def file_version(path):
+    """Return the (mtime_ns, size) pair identifying the current file contents."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ScheduleStore:
+    """Parses schedule files on first use and re-parses only the ones that change.
+
+    At most ``max_entries`` parsed files are kept; the least recently used
+    one is evicted when a new file is loaded past that bound.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, path, cache=True):
+        """Return the cached ``Schedule`` for ``path``, reloading it if the file changed.
+
+        With ``cache=False`` a file that isn't already cached is parsed
+        without being added, so whole-department scans don't flush the
+        sections students are looking at out of the LRU.
+
+        Raises ``FileNotFoundError`` if the file does not exist.
+        """
+        key = os.path.abspath(path)
+        version = file_version(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        # Parse outside the store lock so one slow file doesn't block
+        # sessions reading other sections.
+        table = ScheduleTable.from_csv(key)
+        if not cache:
+            return Schedule(key, version, table)
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current.version == version:
+                # Another session loaded it while we were parsing
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return current
+            if current is not None:
+                self.reloads += 1
+            else:
+                self.misses += 1
+            entry = Schedule(key, version, table)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return entry
+
+    def peek(self, path):
+        """Return the cached ``Schedule`` for ``path`` whatever its version, or None.
+
+        Doesn't stat the file or count as a use.
+        """
+        with self._lock:
+            return self._entries.get(os.path.abspath(path))
+
+    def replace(self, schedule):
+        """Swap in a ``Schedule`` parsed elsewhere for a file that is cached.
+
+        Returns False, keeping nothing, if the file has been evicted or a
+        session already loaded that version.
+        """
+        with self._lock:
+            current = self._entries.get(schedule.path)
+            if current is None or current.version == schedule.version:
+                return False
+            self._entries[schedule.path] = schedule
+            self.reloads += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Module globals survive Streamlit reruns, so this one store is shared by all
+# sessions served by the process.
+store = ScheduleStore()
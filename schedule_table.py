@@ -0,0 +1,205 @@
+"""Compact columnar storage for a parsed schedule.
+
+A section file is kept as a handful of typed ``array`` columns instead of
+an object-dtype DataFrame: the day as a byte, class bounds as 16-bit
+minute-of-week integers, and the text columns as integer codes into
+process-wide string pools. A teacher or room that appears in a hundred
+sections is stored once, and a 10k-row section costs tens of kilobytes
+plus whatever strings are new to the pools.
+
+Rows are kept sorted by (start, end), so the table's ``starts``/``ends``
+are directly the sorted lists the day index bisects. The original strings
+are only looked up when a row is displayed, through a ``Row`` view.
+"""
+
+import csv
+import threading
+from array import array
+
+from schedule_index import DAY_ORDER, MINUTES_PER_DAY, parse_hhmm
+
+# Columns stored as pool codes; "Day" is kept as its DAY_ORDER position
+TEXT_COLUMNS = ["Start_Time", "End_Time", "Course", "Teacher", "Venue"]
+
+
+class StringPool:
+    """Interns strings to small integer codes; codes are never reused."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def code(self, text):
+        code = self._codes.get(text)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(text)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(text)
+                    self._codes[text] = code
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+# Shared by every table in the process, one pool per text column
+POOLS = {column: StringPool() for column in TEXT_COLUMNS}
+
+
+def _text(value):
+    # Blank cells become "", as in the CSV; a DataFrame hands them over as NaN
+    if value is None or value != value:
+        return ""
+    return str(value).strip()
+
+
+class Row:
+    """Read-only view of one class, indexed like the CSV row (``row["Course"]``)."""
+
+    __slots__ = ("table", "i")
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+
+    def __getitem__(self, column):
+        if column == "Day":
+            return DAY_ORDER[self.table.days[self.i]]
+        return self.table.text(column, self.i)
+
+    def get(self, column, default=None):
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        return {column: self[column] for column in ["Day"] + TEXT_COLUMNS}
+
+
+class Rows:
+    """Sequence of ``Row`` views over a table, built on access."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.table)
+        if not 0 <= i < len(self.table):
+            raise IndexError(i)
+        return Row(self.table, i)
+
+    def __iter__(self):
+        return (Row(self.table, i) for i in range(len(self.table)))
+
+
+class ScheduleTable:
+    """One schedule's classes as typed columns, sorted by (start, end).
+
+    ``days[i]`` is the DAY_ORDER position of class i, ``starts[i]``/``ends[i]``
+    its minute-of-week bounds and ``codes[column][i]`` its pool code for
+    each text column. Rows with an unknown day or unparseable time can't be
+    placed in the week and are left out; ``dropped`` counts them so the
+    schedule view can say so.
+    """
+
+    # Tables mapped from a compiled file hold only the rows that were kept
+    dropped = 0
+
+    def __init__(self):
+        self.days = array("b")
+        self.starts = array("h")
+        self.ends = array("h")
+        self.codes = {column: array("I") for column in TEXT_COLUMNS}
+        self.rows = Rows(self)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build a table from {column: sequence of cell values}; missing columns are blank."""
+        n = max((len(values) for values in columns.values()), default=0)
+
+        def cells(column):
+            return columns.get(column, [""] * n)
+
+        # Times and names repeat throughout a timetable, so each distinct
+        # cell is parsed or interned once
+        minutes = {}
+        for text in set(cells("Start_Time")) | set(cells("End_Time")):
+            minutes[text] = parse_hhmm(text)
+        day_offsets = {}
+        for text in set(cells("Day")):
+            day = _text(text)
+            day_offsets[text] = DAY_ORDER.index(day) * MINUTES_PER_DAY if day in DAY_ORDER else None
+
+        keep = []
+        for i, (day, start, end) in enumerate(zip(cells("Day"), cells("Start_Time"), cells("End_Time"))):
+            offset, start, end = day_offsets[day], minutes[start], minutes[end]
+            if offset is None or start is None or end is None:
+                continue
+            keep.append((offset + start, offset + end, i))
+        keep.sort()
+
+        table = cls()
+        table.dropped = n - len(keep)
+        table.starts.extend(r[0] for r in keep)
+        table.ends.extend(r[1] for r in keep)
+        table.days.extend(start // MINUTES_PER_DAY for start in table.starts)
+        for column in TEXT_COLUMNS:
+            values = cells(column)
+            pool = POOLS[column]
+            codes = {text: pool.code(_text(text)) for text in set(values[r[2]] for r in keep)}
+            table.codes[column].extend(codes[values[r[2]]] for r in keep)
+        return table
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from an iterable of {column: value} mappings."""
+        records = list(records)
+        return cls.from_columns({
+            column: [record.get(column) for record in records] for column in ["Day"] + TEXT_COLUMNS
+        })
+
+    @classmethod
+    def from_csv(cls, path):
+        """Parse a schedule CSV with the stdlib reader (no pandas needed)."""
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            columns = [[] for _ in header]
+            for record in reader:
+                if not any(cell.strip() for cell in record):
+                    # A blank line or an all-blank row is not a class; skipped, as
+                    # read_csv skipped blank lines, rather than counted as dropped
+                    continue
+                # Short rows are padded with blanks, extra cells ignored
+                record += [""] * (len(header) - len(record))
+                for values, cell in zip(columns, record):
+                    values.append(cell)
+        return cls.from_columns(dict(zip(header, columns)))
+
+    @classmethod
+    def from_frame(cls, frame):
+        return cls.from_columns({column: frame[column].tolist() for column in frame.columns})
+
+    def __len__(self):
+        return len(self.starts)
+
+    def text(self, column, i):
+        """The original string in text column ``column`` of row ``i``."""
+        return POOLS[column].values[self.codes[column][i]]
+
+    def pool_codes(self, column):
+        """Every row's code in ``POOLS[column]`` for text column ``column``."""
+        return self.codes[column]
+
+    def nbytes(self):
+        """Bytes held by the table's own columns (pooled strings not included)."""
+        columns = [self.days, self.starts, self.ends] + list(self.codes.values())
+        return sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,229 @@
+"""Background watcher that pushes schedule edits to open sessions.
+
+A daemon thread polls the section files' versions every
+``$SCHEDULE_WATCH_INTERVAL`` seconds (default 2). When a section that is
+cached in the store changes, the thread parses it once, diffs its rows day
+by day against the copy it last saw and swaps the new ``Schedule`` into
+the store, carrying over the rendered HTML of every day that did not change.
+The day index, now/next snapshot and exports are rebuilt on next use. No
+session reparses the file: its next ``store.get`` finds the new version
+already loaded.
+
+A section file that fails to parse (bad encoding, half saved) is logged
+once per version and retried on every poll; the thread itself never stops.
+
+Every change is recorded in a feed (a sequence number and the changed
+days per section). Sessions check it from a small fragment and rerun only
+when their own section changed.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from schedule_index import DAY_ORDER
+from schedule_store import Schedule, file_version
+from schedule_table import TEXT_COLUMNS, ScheduleTable
+
+logger = logging.getLogger("class_schedule.watch")
+
+DEFAULT_INTERVAL = float(os.environ.get("SCHEDULE_WATCH_INTERVAL", "2"))
+
+# How often a session's fragment looks at the feed
+SESSION_POLL_SECONDS = 5
+
+# ``days`` lists the day names whose classes changed, or is None when the
+# watcher had no earlier copy of the section to diff against
+Change = namedtuple("Change", ["seq", "section", "days", "at"])
+
+
+def day_rows(table):
+    """Return {day position: that day's rows as column slices} for ``table``.
+
+    Rows are sorted by minute-of-week, so each day is one contiguous run.
+    Text is compared by pool code, which is the same for equal strings.
+    """
+    runs = {}
+    lo = 0
+    for i in range(1, len(table) + 1):
+        if i == len(table) or table.days[i] != table.days[lo]:
+            runs[table.days[lo]] = (
+                table.starts[lo:i],
+                table.ends[lo:i],
+                tuple(table.codes[column][lo:i] for column in TEXT_COLUMNS),
+            )
+            lo = i
+    return runs
+
+
+def changed_days(old, new):
+    """Return the names of the days whose classes differ between two tables."""
+    old_rows, new_rows = day_rows(old), day_rows(new)
+    return [DAY_ORDER[d] for d in sorted(set(old_rows) | set(new_rows)) if old_rows.get(d) != new_rows.get(d)]
+
+
+class ScheduleWatcher:
+    """Polls a registry's section files and applies changes as they appear."""
+
+    def __init__(self, registry, interval=DEFAULT_INTERVAL):
+        self.registry = registry
+        self.interval = interval
+        self.polls = 0
+        self.reparsed = 0
+        self.carried = 0
+        self._versions = None
+        # section -> (version, table) as the watcher last saw it, so a change
+        # is diffed against that even if a session loaded the new file first
+        self._tables = {}
+        self._changes = {}
+        # section -> the version that last failed to load, so it's logged once
+        self._failed = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="schedule-watch", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except OSError:
+                # The source may be mid-rewrite; try again next time
+                pass
+            except Exception:
+                logger.exception("Schedule watch poll failed; retrying")
+            time.sleep(self.interval)
+
+    def poll(self):
+        """Check every section once; returns the ``Change`` records made."""
+        self.polls += 1
+        versions = self.registry.versions()
+        if self._versions is None:
+            self._versions = versions
+            self._remember()
+            return []
+        seen = dict(versions)
+        changes = []
+        for name in sorted(set(versions) | set(self._versions)):
+            version = versions.get(name)
+            if version == self._versions.get(name):
+                continue
+            if version is None:
+                changes.append(self._record(name, None))
+                continue
+            try:
+                applied, days = self._apply(name, version, self._versions.get(name))
+            except Exception:
+                if self._failed.get(name) != version:
+                    logger.exception("Could not reload section %s; keeping the last good copy", name)
+                    self._failed[name] = version
+                applied = False
+            else:
+                self._failed.pop(name, None)
+            if not applied:
+                # Still being written, or unreadable: keep the old version to
+                # retry next poll
+                if name in self._versions:
+                    seen[name] = self._versions[name]
+                else:
+                    del seen[name]
+            elif days is None or days:
+                changes.append(self._record(name, days))
+        self._versions = seen
+        self._remember()
+        return changes
+
+    def _remember(self):
+        """Keep the table of every cached section still at the version last polled."""
+        store = getattr(self.registry, "store", None)
+        if store is None:
+            return
+        for name, version in self._versions.items():
+            if name not in self._tables:
+                cached = store.peek(self.registry.path(name))
+                if cached is not None and cached.version == version:
+                    self._tables[name] = (version, cached.table)
+
+    def _apply(self, name, version, previous):
+        """Reload a changed section into the store; returns (applied, changed days).
+
+        Changed days are None when there is nothing to diff against.
+        """
+        store = getattr(self.registry, "store", None)
+        if store is None:
+            # Not a file-per-section registry: it reloads on its own
+            return True, None
+        path = self.registry.path(name)
+        cached = store.peek(path)
+        seen = self._tables.get(name)
+        if cached is None:
+            # Nobody is looking at it; it is parsed when someone opens it
+            self._tables.pop(name, None)
+            return True, None
+
+        if cached.version == version:
+            # A session rerun between the edit and this poll already loaded
+            # it; the other sessions viewing it still need telling
+            table = cached.table
+        else:
+            table = ScheduleTable.from_csv(path)
+            if file_version(path) != version:
+                return False, None
+            self.reparsed += 1
+        days = changed_days(seen[1], table) if seen is not None else None
+        self._tables[name] = (version, table)
+
+        if cached.version != version:
+            schedule = Schedule(cached.path, version, table)
+            if seen is not None and cached.version == seen[0]:
+                for key, value in list(cached.derived.items()):
+                    # Identical rows: everything still holds. Otherwise only
+                    # the HTML of untouched days does.
+                    if not days or (isinstance(key, tuple) and key[0] == "day_html" and key[1] not in days):
+                        schedule.derived[key] = value
+                        self.carried += 1
+            store.replace(schedule)
+        return True, days
+
+    def _record(self, name, days):
+        with self._lock:
+            self._seq += 1
+            change = Change(self._seq, name, days, time.time())
+            self._changes[name] = change
+        return change
+
+    def latest(self, section):
+        """Return the most recent ``Change`` to ``section``, or None."""
+        return self._changes.get(section)
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "polls": self.polls,
+            "changes": self._seq,
+            "reparsed": self.reparsed,
+            "carried": self.carried,
+        }
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def watch(registry):
+    """Return the running ``ScheduleWatcher`` for ``registry`` (one per process)."""
+    watcher = _watchers.get(registry)
+    if watcher is None:
+        with _watchers_lock:
+            watcher = _watchers.get(registry)
+            if watcher is None:
+                watcher = _watchers[registry] = ScheduleWatcher(registry).start()
+    return watcher
@@ -0,0 +1,103 @@
+"""Discovers which sections exist and where their schedule files live.
+
+Sections come either from a manifest CSV (``Section,File`` rows, paths
+relative to the manifest) or from a directory of ``<section>.csv`` files.
+Discovery only lists names and paths; a section's schedule is parsed the
+first time someone opens it, through the shared bounded ``ScheduleStore``.
+"""
+
+import csv
+import os
+import threading
+
+from schedule_store import file_version, store as default_store
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(APP_DIR, "sections.csv")
+
+
+def read_manifest(path):
+    """Return an ordered {section: file path} mapping from a manifest CSV."""
+    base = os.path.dirname(os.path.abspath(path))
+    sections = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("Section") or "").strip()
+            file = (row.get("File") or "").strip()
+            if name and file:
+                sections[name] = os.path.join(base, file)
+    return sections
+
+
+def scan_directory(path):
+    """Return an ordered {section: file path} mapping for ``*.csv`` files in ``path``."""
+    sections = {}
+    for entry in sorted(os.scandir(path), key=lambda e: e.name):
+        if entry.is_file() and entry.name.lower().endswith(".csv"):
+            sections[entry.name[:-4]] = entry.path
+    return sections
+
+
+class SectionRegistry:
+    """Maps section names to schedule files, re-discovering them when the source changes.
+
+    ``source`` is a manifest CSV or a directory. Its listing is cached on the
+    source's mtime, so a rerun costs one stat() unless sections were added
+    or removed.
+    """
+
+    def __init__(self, source, store=default_store):
+        self.source = source
+        self.store = store
+        self._sections = {}
+        self._source_mtime = None
+        self._lock = threading.Lock()
+
+    def sections(self):
+        """Return the ordered {section: path} mapping."""
+        mtime = os.stat(self.source).st_mtime_ns
+        if mtime != self._source_mtime:
+            with self._lock:
+                if mtime != self._source_mtime:
+                    if os.path.isdir(self.source):
+                        self._sections = scan_directory(self.source)
+                    else:
+                        self._sections = read_manifest(self.source)
+                    self._source_mtime = mtime
+        return self._sections
+
+    def names(self):
+        return list(self.sections())
+
+    def path(self, name):
+        return self.sections()[name]
+
+    def get(self, name, cache=True):
+        """Return the parsed ``Schedule`` for section ``name``, loading it on first use."""
+        return self.store.get(self.path(name), cache=cache)
+
+    def versions(self):
+        """Return {section: (mtime_ns, size)} for every section file that exists."""
+        versions = {}
+        for name, path in self.sections().items():
+            try:
+                versions[name] = file_version(path)
+            except FileNotFoundError:
+                pass
+        return versions
+
+    def stats(self):
+        return dict(self.store.stats(), sections=len(self.sections()))
+
+
+def default_registry():
+    """Registry for the compiled file in ``$SCHEDULE_COMPILED`` if set, else
+    ``$SCHEDULE_DIR`` if set, otherwise the bundled ``sections.csv``."""
+    if os.environ.get("SCHEDULE_COMPILED"):
+        from schedule_compiled import CompiledRegistry
+
+        return CompiledRegistry(os.environ["SCHEDULE_COMPILED"])
+    return SectionRegistry(os.environ.get("SCHEDULE_DIR") or DEFAULT_MANIFEST)
+
+
+registry = default_registry()
@@ -0,0 +1,57 @@
+"""Serve the app together with per-section calendar/JSON feeds.
+
+    streamlit run server.py      (or: uvicorn server:app)
+
+Adds two routes next to the Streamlit page, for calendar apps and scripts:
+
+    /export/<section>.ics    weekly recurring events
+    /export/<section>.json   the timetable as compact JSON
+
+Responses carry an ETag and ``Cache-Control``; a poll with a matching
+``If-None-Match`` gets an empty 304. Bodies come from the per-version
+export cache in ``schedule_export``, so a poll costs a stat() of the
+section file.
+"""
+
+import os
+
+import streamlit as st
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from schedule_export import get_export
+from section_registry import registry
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Calendar clients poll; let them (and any proxy) reuse a feed for a while
+CACHE_CONTROL = "public, max-age=300"
+
+
+def load_export(section, fmt):
+    if section not in registry.sections():
+        return None
+    return get_export(section, registry.get(section), fmt)
+
+
+async def export(request):
+    section = request.path_params["section"]
+    fmt = request.path_params["fmt"]
+    if fmt not in ("ics", "json"):
+        return PlainTextResponse("Unknown format", status_code=404)
+    try:
+        exported = await run_in_threadpool(load_export, section, fmt)
+    except FileNotFoundError:
+        exported = None
+    if exported is None:
+        return PlainTextResponse(f"No section named {section!r}", status_code=404)
+
+    headers = {"ETag": exported.etag, "Cache-Control": CACHE_CONTROL}
+    if exported.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Disposition"] = f'inline; filename="{exported.filename}"'
+    return Response(exported.body, media_type=exported.content_type, headers=headers)
+
+
+app = st.App(os.path.join(APP_DIR, "app.py"), routes=[Route("/export/{section}.{fmt}", export)])
@@ -0,0 +1,13 @@
+from department import Department
+from schedule_store import Schedule
+from schedule_table import ScheduleTable
+
+COLUMNS = ["Day", "Start_Time", "End_Time", "Course", "Teacher", "Venue"]
+
+
+def department(sections):
+    """A ``Department`` from {section: [(day, start, end, course, teacher, venue), ...]}."""
+    return Department({
+        name: Schedule(name, None, ScheduleTable.from_records(dict(zip(COLUMNS, row)) for row in rows))
+        for name, rows in sections.items()
+    })
@@ -0,0 +1,22 @@
+from availability import AvailabilityIndex
+from tests.helpers import department
+
+
+def test_blank_cells_are_not_teachers_or_rooms():
+    availability = AvailabilityIndex(department({
+        "A": [
+            ("Monday", "08:00", "09:00", "Math", "", "R1"),
+            ("Monday", "09:00", "10:00", "Physics", "Dr. X", " "),
+        ],
+    }))
+    assert availability.teacher_names() == ["Dr. X"]
+    assert availability.free_venues("Monday", 9 * 60, 10 * 60) == ["R1"]
+    assert availability.free_venues("Monday", 8 * 60, 9 * 60) == []
+
+
+def test_teacher_free_is_the_complement_of_classes():
+    availability = AvailabilityIndex(department({
+        "A": [("Monday", "09:00", "10:00", "Math", "Dr. X", "R1")],
+        "B": [("Monday", "09:30", "11:00", "Physics", "Dr.X", "R2")],
+    }))
+    assert availability.teacher_free("Dr. X") == {"Monday": [(8 * 60, 9 * 60), (11 * 60, 18 * 60)]}
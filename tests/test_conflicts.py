@@ -0,0 +1,83 @@
+import random
+from itertools import combinations
+
+from conflicts import Booking, describe, find_conflicts, is_combined_class, resource_key
+from schedule_index import DAY_ORDER
+from tests.helpers import department
+
+
+def test_blank_teacher_or_venue_is_not_a_clash():
+    dept = department({
+        "A": [("Monday", "08:00", "09:00", "Math", "", "R1")],
+        "B": [("Monday", "08:30", "09:30", "Physics", " ", "")],
+        "C": [("Monday", "08:30", "09:30", "Chemistry", "Dr. X", "")],
+    })
+    assert find_conflicts(dept) == []
+
+
+def test_names_are_compared_loosely_and_combined_classes_are_not_clashes():
+    dept = department({
+        "A": [("Monday", "08:00", "09:00", "Math", "Dr.Shahzad", "R1")],
+        "B": [("Monday", "08:30", "09:30", "Physics", "Dr. Shahzad", "R2")],
+        "C": [("Tuesday", "08:00", "09:00", "Math", "Dr. Y", "R3")],
+        "D": [("Tuesday", "08:00", "09:00", "Math", "Dr. Y", "R3")],
+    })
+    conflicts = find_conflicts(dept)
+    assert [(c.kind, [b.section for b in c.bookings], c.pairs) for c in conflicts] == [("teacher", ["A", "B"], 1)]
+
+
+def brute_force(dept):
+    found = set()
+    for a, b in combinations(range(len(dept)), 2):
+        if not (dept.starts[a] < dept.ends[b] and dept.starts[b] < dept.ends[a]):
+            continue
+        first = Booking(dept.section(a), dept.rows[a], dept.starts[a], dept.ends[a])
+        second = Booking(dept.section(b), dept.rows[b], dept.starts[b], dept.ends[b])
+        if is_combined_class(first, second):
+            continue
+        for kind in ("teacher", "venue"):
+            key = resource_key(dept.rows[a][kind.capitalize()])
+            if key and key == resource_key(dept.rows[b][kind.capitalize()]):
+                found.add((kind, frozenset([a, b])))
+    return found
+
+
+def test_sweep_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(50):
+        sections = {}
+        for s in range(rng.randint(1, 5)):
+            rows = []
+            for _ in range(rng.randint(0, 12)):
+                start = rng.randrange(8 * 60, 17 * 60, 5)
+                end = start + rng.choice([30, 50, 60, 90])
+                rows.append((
+                    rng.choice(DAY_ORDER[:3]),
+                    f"{start // 60}:{start % 60:02d}",
+                    f"{end // 60}:{end % 60:02d}",
+                    rng.choice(["Math", "Physics"]),
+                    rng.choice(["Dr. A", "Dr.A", "Dr. B", ""]),
+                    rng.choice(["R1", "R2", ""]),
+                ))
+            sections[f"S{s}"] = rows
+        dept = department(sections)
+        expected = brute_force(dept)
+        conflicts = find_conflicts(dept)
+        # Every clashing pair falls in one run, and each run counts its pairs
+        run_of = {}
+        for r, c in enumerate(conflicts):
+            for b in c.bookings:
+                run_of[c.kind, b.row.i] = r
+        for kind, pair in expected:
+            a, b = pair
+            assert run_of[kind, a] == run_of[kind, b]
+        for kind in ("teacher", "venue"):
+            assert sum(c.pairs for c in conflicts if c.kind == kind) == sum(k == kind for k, _ in expected)
+
+
+def test_a_shared_placeholder_is_one_clash_not_every_pair():
+    rows = [("Monday", "8:00", "10:00", f"Course {i}", "TBA", f"R{i}") for i in range(300)]
+    rows.append(("Monday", "10:00", "11:00", "Late", "TBA", "R0"))
+    conflicts = find_conflicts(department({"A": rows[:150], "B": rows[150:]}))
+    assert [(c.kind, c.resource, len(c.bookings), c.pairs) for c in conflicts] == [("teacher", "TBA", 300, 300 * 299 // 2)]
+    assert describe(conflicts[0], "B").count(" B Course") == 6
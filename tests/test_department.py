@@ -0,0 +1,21 @@
+from department import DepartmentView
+from schedule_store import ScheduleStore
+from section_registry import SectionRegistry
+
+HEADER = b"Day,Start_Time,End_Time,Course,Teacher,Venue\r\n"
+
+
+def test_unreadable_sections_are_listed_and_left_out(tmp_path):
+    (tmp_path / "GOOD.csv").write_bytes(HEADER + b"Monday,8:00,9:00,Math,Dr. X,R1\r\nTuesday,9:00,10:00,Physics,Dr. Y,R2\r\n")
+    (tmp_path / "BAD.csv").write_bytes(HEADER + "Monday,8:00,9:00,Café,Dr. X,R1\r\n".encode("latin-1"))
+    store = ScheduleStore()
+    department = DepartmentView(SectionRegistry(str(tmp_path), store)).get()
+
+    assert department.section_names == ["GOOD"]
+    assert list(department.unreadable) == ["BAD"]
+    assert [(department.section(n), row["Day"], row["Course"]) for n, row in enumerate(department.rows)] == [
+        ("GOOD", "Monday", "Math"),
+        ("GOOD", "Tuesday", "Physics"),
+    ]
+    # Scanning the department doesn't load sections into the store
+    assert store.stats()["entries"] == 0
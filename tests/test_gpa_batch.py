@@ -0,0 +1,31 @@
+import random
+
+import pandas as pd
+
+from benchmarks.synth import synthetic_marks
+from gpa import cgpa, input_key, subjects_data, update_results
+from gpa_batch import batch_gpa
+
+
+def test_batch_matches_the_calculator_exactly():
+    rng = random.Random(0)
+    students = [
+        {sub["name"]: tuple(synthetic_marks(rng) for _ in sub["components"]) for sub in subjects_data}
+        for _ in range(3000)
+    ]
+    # Scores landing exactly on a grade threshold, where float order matters
+    students.append({sub["name"]: ("17/20",) * len(sub["components"]) for sub in subjects_data})
+    gradebook = pd.DataFrame([
+        {input_key(sub["name"], comp): entry for sub in subjects_data for (comp, _), entry in zip(sub["components"], entries[sub["name"]])}
+        for entries in students
+    ])
+
+    graded = batch_gpa(gradebook)
+    for i, entries in enumerate(students):
+        results = {}
+        update_results(results, entries)
+        for sub in subjects_data:
+            expected = results[sub["name"]]
+            assert graded.loc[i, f"{sub['name']} %"] == (expected.percentage or 0.0)
+            assert graded.loc[i, f"{sub['name']} GP"] == expected.grade_point
+        assert graded.loc[i, "CGPA"] == cgpa(results)
@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+
+from gpa_batch import batch_gpa
+from gpa_ingest import ingest
+
+
+def write_gradebook(path):
+    # Bare numbers are percentages; the first two rows hold nothing but,
+    # so a two-row chunk would be inferred as a numeric column
+    pd.DataFrame({
+        "Student": ["a", "b", "c", "d", "e"],
+        "OHS_Quiz 1": ["85", "70.5", "8/10", "", "abc"],
+        "OHS_Finals": ["90", "", "30/40", "35/40", "100"],
+    }).to_csv(path, index=False)
+
+
+def test_grades_do_not_depend_on_chunk_size(tmp_path):
+    src = tmp_path / "marks.csv"
+    write_gradebook(src)
+    expected = batch_gpa(pd.read_csv(src, dtype=str))
+    assert expected.loc[0, "OHS %"] > 0
+    # Rounded and through CSV, as the ingested results are
+    expected = pd.read_csv(io.StringIO(expected.round(2).to_csv(index=False)))
+
+    for chunksize in (1, 2, 3, 10):
+        dest = tmp_path / f"results-{chunksize}.csv"
+        rows, _ = ingest(str(src), str(dest), chunksize=chunksize, workers=1)
+        assert rows == 5
+        pd.testing.assert_frame_equal(pd.read_csv(dest), expected, obj=f"chunksize={chunksize}")
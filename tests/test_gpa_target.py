@@ -0,0 +1,62 @@
+import random
+from itertools import product
+
+from benchmarks.synth import synthetic_marks
+from gpa import get_score_percentage, grade_subject, subjects_data
+from gpa_target import _fill, solve, subject_options
+
+
+def random_case(rng):
+    subjects = rng.sample(subjects_data, rng.randint(1, 4))
+    entries = {sub["name"]: tuple(synthetic_marks(rng) if rng.random() < 0.6 else "" for _ in sub["components"]) for sub in subjects}
+    return subjects, entries, rng.choice([1.0, 2.0, 2.5, 3.0, 3.33, 3.5, 3.8, 4.0])
+
+
+def brute_force(subjects, entries, target):
+    """(reachable, least cost) over every combination of grade options."""
+    options = [subject_options(sub, entries[sub["name"]]) for sub in subjects]
+    credits = sum(sub["cr"] for sub in subjects)
+    combos = []
+    for choice in product(*options):
+        points = sum(round(gp * 100) * sub["cr"] for sub, (gp, _, _) in zip(subjects, choice))
+        cost = sum(sub["cr"] * c for sub, (_, _, c) in zip(subjects, choice))
+        combos.append((points, cost))
+    need = round(target * 100) * credits
+    best_points = max(points for points, _ in combos)
+    if best_points < need:
+        return False, min(cost for points, cost in combos if points == best_points)
+    return True, min(cost for points, cost in combos if points >= need)
+
+
+def plan_cost(subjects, entries, plan):
+    options = {sub["name"]: {gp: cost for gp, _, cost in subject_options(sub, entries[sub["name"]])} for sub in subjects}
+    return sum(sub["cr"] * options[sub["name"]][plan.subjects[sub["name"]].grade_point] for sub in subjects)
+
+
+def test_solver_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        subjects, entries, target = random_case(rng)
+        plan = solve(entries, target, subjects)
+        reachable, cost = brute_force(subjects, entries, target)
+        assert plan.reachable == reachable, (entries, target)
+        assert abs(plan_cost(subjects, entries, plan) - cost) < 1e-9, (entries, target)
+        if reachable:
+            assert plan.cgpa >= target - 1e-9
+
+
+def test_plans_reach_their_grade_and_no_lower_score_does():
+    rng = random.Random(1)
+    for _ in range(200):
+        subjects, entries, target = random_case(rng)
+        plan = solve(entries, target, subjects)
+        for sub in subjects:
+            sub_entries = entries[sub["name"]]
+            part = plan.subjects[sub["name"]]
+            if part.needed_percentage is None:
+                continue
+            remaining = [i for i, entry in enumerate(sub_entries) if get_score_percentage(entry) is None]
+            assert grade_subject(sub, _fill(sub_entries, remaining, part.needed_percentage)).grade_point >= part.grade_point
+            lower = round(part.needed_percentage - 0.01, 2)
+            if lower >= 0:
+                assert grade_subject(sub, _fill(sub_entries, remaining, lower)).grade_point < part.grade_point
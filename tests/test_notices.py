@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from notices import TIMEZONE, NoticeStore, main, parse_time
+
+
+def test_assignment_due_on_a_day_is_shown_until_that_day_ends(tmp_path):
+    db = str(tmp_path / "notices.db")
+    main(["--db", db, "add", "A", "assignment", "Lab 5", "--due", "2025-09-15"])
+    main(["--db", db, "add", "A", "assignment", "Lab 6", "--due", "2025-09-15T10:00"])
+    notices = NoticeStore(db)
+
+    morning = datetime(2025, 9, 15, 9, 0, tzinfo=TIMEZONE).timestamp()
+    evening = datetime(2025, 9, 15, 23, 0, tzinfo=TIMEZONE).timestamp()
+    assert [item.body for item in notices.items("A", morning) if item.kind == "assignment"] == ["Lab 5", "Lab 6"]
+    assert [item.body for item in notices.items("A", evening) if item.kind == "assignment"] == ["Lab 5"]
+    assert [item.due for item in notices.items("A", active=False) if item.body == "Lab 5"] == [parse_time("2025-09-15")]
+    assert "(due Mon 15 Sep)" in notices.section_html("A", morning)
@@ -0,0 +1,71 @@
+import random
+
+from department import Department
+from schedule_compiled import CompiledRegistry, compile_tables
+from schedule_index import DAY_ORDER, MINUTES_PER_WEEK, get_index
+from schedule_store import Schedule
+from schedule_table import ScheduleTable
+
+COLUMNS = ["Day", "Start_Time", "End_Time", "Course", "Teacher", "Venue"]
+
+
+def sections():
+    rng = random.Random(0)
+    teachers = ["Dr. Shahzad", "Dr. Ümit Çelik", "محمد علی", "Prof. 李", ""]
+    venues = ["C-13", "Café Hall", "Lab 🧪", ""]
+    tables = {}
+    for name in ["BSCE-1A", "Ünïcode §", "EMPTY", "Big"]:
+        rows = []
+        for n in range(0 if name == "EMPTY" else rng.randint(5, 40)):
+            start = rng.randrange(8 * 60, 17 * 60, 5)
+            end = start + rng.choice([50, 90])
+            rows.append(dict(zip(COLUMNS, [
+                rng.choice(DAY_ORDER[:6]),
+                f"{start // 60}:{start % 60:02d}",
+                f"{end // 60}:{end % 60:02d}",
+                f"Course {n} – Ünit {rng.randint(1, 3)}",
+                rng.choice(teachers),
+                rng.choice(venues),
+            ])))
+        tables[name] = ScheduleTable.from_records(rows)
+    return tables
+
+
+def test_compiled_sections_read_back_like_the_tables(tmp_path):
+    tables = sections()
+    path = tmp_path / "schedules.bin"
+    compile_tables(tables, str(path))
+    registry = CompiledRegistry(str(path))
+
+    assert registry.names() == list(tables)
+    for name, table in tables.items():
+        mapped = registry.get(name).table
+        assert len(mapped) == len(table)
+        assert [row.to_dict() for row in mapped.rows] == [row.to_dict() for row in table.rows]
+        assert list(mapped.days) == list(table.days)
+
+        index, expected = get_index(registry.get(name)), get_index(Schedule(name, None, table))
+        for minute in range(0, MINUTES_PER_WEEK, 7):
+            current, upcoming, start = index.now_next(minute)
+            current_e, upcoming_e, start_e = expected.now_next(minute)
+            assert [row.to_dict() for row in current] == [row.to_dict() for row in current_e]
+            assert (upcoming and upcoming.to_dict(), start) == (upcoming_e and upcoming_e.to_dict(), start_e)
+            assert index.next_boundary(minute) == expected.next_boundary(minute)
+
+    # The department built from mapped tables reads the same strings
+    mapped = Department({name: registry.get(name) for name in registry.names()})
+    parsed = Department({name: Schedule(name, None, table) for name, table in tables.items()})
+    assert [row.to_dict() for row in mapped.rows] == [row.to_dict() for row in parsed.rows]
+
+
+def test_recompiling_replaces_the_mapped_file(tmp_path):
+    path = tmp_path / "schedules.bin"
+    tables = sections()
+    compile_tables({"A": tables["BSCE-1A"]}, str(path))
+    registry = CompiledRegistry(str(path))
+    assert registry.names() == ["A"]
+
+    compile_tables({"A": tables["EMPTY"], "B": tables["Big"]}, str(path))
+    assert registry.names() == ["A", "B"]
+    assert len(registry.get("A").table) == 0
+    assert len(registry.get("B").table) == len(tables["Big"])
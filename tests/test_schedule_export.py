@@ -0,0 +1,28 @@
+from datetime import date
+
+from schedule_export import iter_ics
+from schedule_index import ScheduleIndex
+from schedule_table import ScheduleTable
+
+
+def rules(start, end):
+    index = ScheduleIndex(ScheduleTable.from_records([
+        {"Day": "Monday", "Start_Time": "8:00", "End_Time": "9:00", "Course": "Math"},
+        {"Day": "Friday", "Start_Time": "14:00", "End_Time": "15:00", "Course": "Physics"},
+    ]))
+    feed = b"".join(iter_ics("A", index, start, end)).decode()
+    return [line for line in feed.split("\r\n") if line.startswith(("DTSTART;", "RRULE"))]
+
+
+def test_events_repeat_until_the_end_of_the_last_day_of_term():
+    assert rules(date(2025, 9, 1), date(2025, 12, 19)) == [
+        "DTSTART;TZID=Asia/Karachi:20250901T080000",
+        "RRULE:FREQ=WEEKLY;UNTIL=20251219T185959Z;BYDAY=MO",
+        "DTSTART;TZID=Asia/Karachi:20250905T140000",
+        "RRULE:FREQ=WEEKLY;UNTIL=20251219T185959Z;BYDAY=FR",
+    ]
+
+
+def test_events_repeat_indefinitely_without_a_term_end(monkeypatch):
+    monkeypatch.delenv("SCHEDULE_TERM_END", raising=False)
+    assert rules(date(2025, 9, 1), None)[1] == "RRULE:FREQ=WEEKLY;BYDAY=MO"
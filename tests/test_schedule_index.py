@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta
+
+from schedule_index import DAY_ORDER, MINUTES_PER_WEEK, NowNextSnapshot, ScheduleIndex, minute_of_week
+from schedule_table import ScheduleTable
+
+
+def table(classes):
+    """A table from (day, "HH:MM", "HH:MM", course) tuples."""
+    return ScheduleTable.from_records(
+        {"Day": day, "Start_Time": start, "End_Time": end, "Course": course} for day, start, end, course in classes
+    )
+
+
+def answer(value):
+    """A now/next answer as plain data: (current courses, next course, next start)."""
+    current, upcoming, start = value
+    return [row["Course"] for row in current], upcoming and upcoming["Course"], start
+
+
+def brute_force(index, minute):
+    current = [row for row, s, e in zip(index.rows, index.starts, index.ends) if s <= minute < e]
+    later = [(s, i) for i, s in enumerate(index.starts) if s > minute]
+    if not index.starts:
+        return answer(([], None, None))
+    s, i = min(later) if later else (index.starts[0] + MINUTES_PER_WEEK, 0)
+    return answer((current, index.rows[i], s))
+
+
+def random_index(rng):
+    classes = []
+    for n in range(rng.randint(0, 15)):
+        start = rng.randrange(0, 23 * 60, 5)
+        end = min(start + rng.choice([5, 30, 50, 90, 180]), 23 * 60 + 55)
+        classes.append((rng.choice(DAY_ORDER), f"{start // 60}:{start % 60:02d}", f"{end // 60}:{end % 60:02d}", f"C{n}"))
+    return ScheduleIndex(table(classes))
+
+
+def test_now_next_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        index = random_index(rng)
+        # Every boundary and the minutes either side, plus random minutes
+        minutes = {m + d for m in list(index.starts) + list(index.ends) for d in (-1, 0, 1)}
+        minutes |= {rng.randrange(MINUTES_PER_WEEK) for _ in range(50)} | {0, MINUTES_PER_WEEK - 1}
+        for minute in sorted(m for m in minutes if 0 <= m < MINUTES_PER_WEEK):
+            assert answer(index.now_next(minute)) == brute_force(index, minute), minute
+            # Nothing changes before the next boundary
+            boundary = index.next_boundary(minute)
+            assert boundary > minute
+            before = min(boundary - 1, MINUTES_PER_WEEK - 1)
+            assert answer(index.now_next(before)) == answer(index.now_next(minute)), minute
+
+
+def test_snapshot_matches_the_index_over_two_weeks():
+    rng = random.Random(1)
+    for _ in range(20):
+        index = random_index(rng)
+        snapshot = NowNextSnapshot(index)
+        now = datetime(2025, 9, 1)
+        end = now + timedelta(weeks=2)
+        while now < end:
+            assert answer(snapshot.get(now)) == answer(index.now_next(minute_of_week(now))), now
+            now += timedelta(minutes=rng.randint(1, 240), seconds=rng.randint(0, 59))
+
+
+def at(day, hhmm):
+    return DAY_ORDER.index(day) * 24 * 60 + int(hhmm[:2]) * 60 + int(hhmm[3:])
+
+
+def test_overlaps_hand_over_and_week_wrap():
+    index = ScheduleIndex(table([
+        ("Monday", "09:50", "10:40", "Monday first"),
+        ("Monday", "10:40", "11:30", "Back to back"),
+        ("Monday", "11:00", "12:00", "Overlapping"),
+        ("Friday", "14:00", "15:00", "Friday last"),
+    ]))
+    # Half-open: at 10:40 the first class is over and the next is on
+    assert answer(index.now_next(at("Monday", "10:39"))) == (["Monday first"], "Back to back", at("Monday", "10:40"))
+    assert answer(index.now_next(at("Monday", "10:40"))) == (["Back to back"], "Overlapping", at("Monday", "11:00"))
+    assert answer(index.now_next(at("Monday", "11:15"))) == (["Back to back", "Overlapping"], "Friday last", at("Friday", "14:00"))
+    # Saturday night: next is Monday 09:50 of next week
+    assert answer(index.now_next(at("Saturday", "23:00"))) == ([], "Monday first", at("Monday", "09:50") + MINUTES_PER_WEEK)
+    assert index.next_boundary(at("Sunday", "23:30")) == MINUTES_PER_WEEK
@@ -0,0 +1,27 @@
+from schedule_table import ScheduleTable
+
+
+def test_rows_that_cannot_be_placed_are_counted():
+    table = ScheduleTable.from_records([
+        {"Day": "Monday", "Start_Time": "8:00", "End_Time": "9:00", "Course": "Math"},
+        {"Day": "Tues", "Start_Time": "8:00", "End_Time": "9:00", "Course": "Physics"},
+        {"Day": "Tuesday", "Start_Time": "9.50", "End_Time": "10:40", "Course": "Chemistry"},
+        {"Day": " Tuesday ", "Start_Time": "09:50", "End_Time": "10:40", "Course": "English"},
+    ])
+    assert [row["Course"] for row in table.rows] == ["Math", "English"]
+    assert table.dropped == 2
+
+
+def test_blank_lines_in_a_csv_are_skipped_not_dropped(tmp_path):
+    path = tmp_path / "section.csv"
+    path.write_bytes(
+        b"Day,Start_Time,End_Time,Course,Teacher,Venue\r\n"
+        b"Monday,8:00,9:00,Math,Dr. X,R1\r\n"
+        b"\r\n"
+        b",,,,,\r\n"
+        b"Tuesday,9:00,10:00,Physics,Dr. Y,R2\r\n"
+        b"\r\n\r\n\r\n\r\n"
+    )
+    table = ScheduleTable.from_csv(path)
+    assert [row["Course"] for row in table.rows] == ["Math", "Physics"]
+    assert table.dropped == 0
@@ -0,0 +1,92 @@
+import csv
+import os
+
+from schedule_render import day_html
+from schedule_store import ScheduleStore
+from schedule_watch import ScheduleWatcher
+from section_registry import SectionRegistry
+
+HEADER = ["Day", "Start_Time", "End_Time", "Course", "Teacher", "Venue"]
+ROWS = [
+    ["Monday", "08:00", "09:00", "Math", "A", "R1"],
+    ["Monday", "09:30", "10:30", "Physics", "B", "R2"],
+    ["Tuesday", "08:00", "09:00", "Chemistry", "C", "R3"],
+]
+
+
+def write(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows([HEADER] + rows)
+    # Make sure the version changes even on a coarse-mtime filesystem
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def setup(tmp_path):
+    path = tmp_path / "S1.csv"
+    write(path, ROWS)
+    store = ScheduleStore()
+    registry = SectionRegistry(str(tmp_path), store)
+    watcher = ScheduleWatcher(registry)
+    for day in ("Monday", "Tuesday"):
+        day_html(registry.get("S1"), day)
+    watcher.poll()
+    return path, registry, watcher
+
+
+def edited():
+    rows = [list(row) for row in ROWS]
+    rows[2][3] = "Chemistry Lab"
+    return rows
+
+
+def test_edit_reports_changed_days_and_keeps_other_days(tmp_path):
+    path, registry, watcher = setup(tmp_path)
+    before = registry.get("S1")
+    write(path, edited())
+
+    changes = watcher.poll()
+
+    assert [(c.section, c.days) for c in changes] == [("S1", ["Tuesday"])]
+    after = registry.store.peek(str(path))
+    assert after is not before
+    assert after.derived[("day_html", "Monday")] is before.derived[("day_html", "Monday")]
+    assert ("day_html", "Tuesday") not in after.derived
+    assert "Chemistry Lab" in day_html(registry.get("S1"), "Tuesday")
+    assert registry.get("S1") is after
+
+
+def test_edit_loaded_by_a_session_before_the_poll_is_still_reported(tmp_path):
+    path, registry, watcher = setup(tmp_path)
+    write(path, edited())
+    # A session reruns before the watcher's next poll and loads the new file
+    registry.get("S1")
+
+    changes = watcher.poll()
+
+    assert [(c.section, c.days) for c in changes] == [("S1", ["Tuesday"])]
+    assert watcher.latest("S1").days == ["Tuesday"]
+
+
+def test_touch_without_row_changes_is_not_reported(tmp_path):
+    path, registry, watcher = setup(tmp_path)
+    write(path, ROWS)
+
+    assert watcher.poll() == []
+    assert watcher.latest("S1") is None
+    assert ("day_html", "Monday") in registry.store.peek(str(path)).derived
+
+
+def test_an_unreadable_edit_is_retried_until_fixed(tmp_path, caplog):
+    path, registry, watcher = setup(tmp_path)
+    path.write_bytes(",".join(HEADER).encode() + "\r\nTuesday,08:00,09:00,Café,C,R3\r\n".encode("latin-1"))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert watcher.poll() == []
+    assert watcher.poll() == []
+    assert len([r for r in caplog.records if "S1" in r.getMessage()]) == 1
+
+    write(path, edited())
+    changes = watcher.poll()
+    assert [(c.section, c.days) for c in changes] == [("S1", ["Tuesday"])]
@@ -0,0 +1,143 @@
+"""Week-at-a-glance grid of a section, and of several sections side by side.
+
+The grid is computed in one vectorized pass over the index's sorted
+minute-of-week columns: class times are binned to ``SLOT_MINUTES`` slots
+and pivoted into a day x slot occupancy matrix (a +1/-1 difference array
+summed along each day), runs of busy slots become the grid's cells, and
+breaks are found with ``diff`` on the sorted starts and running-max ends.
+Python only walks the resulting cells to write the HTML.
+
+Each day's row of cells is cached on the parsed schedule for the data
+version and slot range, so a whole week is one ``st.markdown`` delta and
+comparing sections reuses every section's cached rows. Imported only when
+the grid is shown: it needs numpy, which the rest of the schedule view
+doesn't load.
+"""
+
+import html
+from collections import namedtuple
+
+import numpy as np
+
+from availability import DAY_END, DAY_START, format_minutes
+from schedule_index import BREAK_MIN_MINUTES, DAY_ORDER, MINUTES_PER_DAY, format_break, get_index
+
+SLOT_MINUTES = 30
+
+# ``cells`` maps each day name to that day's ``<td>`` cells, spanning
+# [lo, hi) minutes after midnight in ``slot``-minute columns
+WeekGrid = namedtuple("WeekGrid", ["lo", "hi", "slot", "cells"])
+
+
+def grid_range(indexes, slot=SLOT_MINUTES):
+    """The (lo, hi) minutes of day covering the teaching day and every class in ``indexes``."""
+    lo, hi = DAY_START, DAY_END
+    for index in indexes:
+        if len(index):
+            starts = np.frombuffer(index.starts, dtype=np.int16).astype(np.int32)
+            midnight = starts - starts % MINUTES_PER_DAY
+            ends = np.frombuffer(index.ends, dtype=np.int16) - midnight
+            lo = min(lo, int((starts - midnight).min()) // slot * slot)
+            hi = max(hi, -(-int(ends.max()) // slot) * slot)
+    return lo, min(hi, MINUTES_PER_DAY)
+
+
+def class_html(row):
+    course, venue = row["Course"], row["Venue"]
+    title = html.escape(f"{course} · {row['Start_Time']}–{row['End_Time']} · {row['Teacher']} · {venue}")
+    return f'<div class="grid-class" title="{title}"><b>{course}</b><br>{venue}</div>'
+
+
+def build_grid(index, lo, hi, slot=SLOT_MINUTES):
+    """Lay ``index``'s classes out on a day x slot grid; returns a ``WeekGrid``."""
+    slots = (hi - lo) // slot
+    starts = np.frombuffer(index.starts, dtype=np.int16).astype(np.int32)
+    ends = np.frombuffer(index.ends, dtype=np.int16).astype(np.int32)
+    day = starts // MINUTES_PER_DAY
+    midnight = day * MINUTES_PER_DAY
+
+    # Bin each class to the slots it touches (at least one)
+    first = np.clip((starts - midnight - lo) // slot, 0, slots - 1)
+    last = np.maximum(np.clip(-(-(ends - midnight - lo) // slot), 0, slots), first + 1)
+
+    # Pivot: +1 where a class starts, -1 after it ends, summed along the day
+    occupancy = np.zeros((len(DAY_ORDER), slots + 1), dtype=np.int32)
+    np.add.at(occupancy, (day, first), 1)
+    np.add.at(occupancy, (day, last), -1)
+    busy = np.zeros((len(DAY_ORDER), slots + 2), dtype=np.int8)
+    busy[:, 1:-1] = occupancy.cumsum(axis=1)[:, :slots] > 0
+
+    # Runs of busy slots are the grid's cells; row-major order pairs each
+    # run's start with its end
+    edges = np.diff(busy, axis=1)
+    run_day, run_start = np.nonzero(edges == 1)
+    _, run_end = np.nonzero(edges == -1)
+    run_of_class = np.searchsorted(run_day * slots + run_start, day * slots + first, side="right") - 1
+    order = np.argsort(run_of_class, kind="stable")
+    members = np.split(order, np.searchsorted(run_of_class[order], np.arange(1, len(run_day))))
+
+    # A break ends where a class starts after a long enough gap the same day
+    latest = np.maximum.accumulate(ends) if len(ends) else ends
+    gaps = starts[1:] - latest[:-1]
+    after_break = np.flatnonzero((day[1:] == day[:-1]) & (gaps > BREAK_MIN_MINUTES)) + 1
+    breaks = {(int(day[i]), int(first[i])): int(gaps[i - 1]) for i in after_break}
+
+    cells = {}
+    for d in sorted(set(day.tolist())):
+        parts = []
+        position = 0
+        for run in np.flatnonzero(run_day == d):
+            start, end = int(run_start[run]), int(run_end[run])
+            if start > position:
+                gap = breaks.get((d, start))
+                if gap is None:
+                    parts.append(f'<td class="grid-free" colspan="{start - position}"></td>')
+                else:
+                    parts.append(f'<td class="grid-break" colspan="{start - position}">☕ {format_break(gap)}</td>')
+            classes = "".join(class_html(index.rows[i]) for i in members[run].tolist())
+            parts.append(f'<td class="grid-busy" colspan="{end - start}">{classes}</td>')
+            position = end
+        if position < slots:
+            parts.append(f'<td class="grid-free" colspan="{slots - position}"></td>')
+        cells[DAY_ORDER[d]] = "".join(parts)
+    return WeekGrid(lo, hi, slot, cells)
+
+
+def get_grid(schedule, lo, hi, slot=SLOT_MINUTES):
+    """Return the cached ``WeekGrid`` of ``schedule`` for the given slot range."""
+    return schedule.derive(("week_grid", lo, hi, slot), lambda s: build_grid(get_index(s), lo, hi, slot))
+
+
+def header_html(lo, hi, slot, leading):
+    labels = "".join(
+        f'<th class="grid-time">{format_minutes(minute) if minute % 60 == 0 else ""}</th>'
+        for minute in range(lo, hi, slot)
+    )
+    return f"<thead><tr>{'<th></th>' * leading}{labels}</tr></thead>"
+
+
+def week_grid_html(schedule, slot=SLOT_MINUTES):
+    """Return the cached HTML table of ``schedule``'s whole week."""
+    def build(s):
+        index = get_index(s)
+        lo, hi = grid_range([index], slot)
+        grid = get_grid(s, lo, hi, slot)
+        rows = "".join(f'<tr><th class="grid-day">{day[:3]}</th>{grid.cells[day]}</tr>' for day in index.days)
+        return f'<table class="week-grid">{header_html(lo, hi, slot, 1)}<tbody>{rows}</tbody></table>'
+
+    return schedule.derive(("week_grid_html", slot), build)
+
+
+def compare_html(schedules, slot=SLOT_MINUTES):
+    """One table comparing {section: schedule}: for each day, a row per section on a shared time axis."""
+    indexes = {name: get_index(schedule) for name, schedule in schedules.items()}
+    lo, hi = grid_range(indexes.values(), slot)
+    grids = {name: get_grid(schedule, lo, hi, slot) for name, schedule in schedules.items()}
+    empty = f'<td class="grid-free" colspan="{(hi - lo) // slot}"></td>'
+    days = [day for day in DAY_ORDER if any(day in grid.cells for grid in grids.values())]
+    rows = []
+    for day in days:
+        for n, (name, grid) in enumerate(grids.items()):
+            label = f'<th class="grid-day" rowspan="{len(grids)}">{day[:3]}</th>' if n == 0 else ""
+            rows.append(f'<tr class="{"grid-first" if n == 0 else ""}">{label}<th class="grid-section">{name}</th>{grid.cells.get(day, empty)}</tr>')
+    return f'<table class="week-grid">{header_html(lo, hi, slot, 2)}<tbody>{"".join(rows)}</tbody></table>'